@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 import sys
 import os
+import subprocess
 from colorama import Fore, Style, init
 
 # Import module kita
 from sql_inject import XvoidSQLScanner
+from targets import Scope, ScopeError, TargetQueue, iter_targets
 
 init(autoreset=True)
 
@@ -25,6 +27,10 @@ def print_banner():
     """
     print(banner)
 
+def prompt_next_page(shown, total):
+    answer = input(f"{Fore.RED}[{shown}/{total}] Enter for more, q to stop: {Style.RESET_ALL}")
+    return answer.strip().lower() != 'q'
+
 def show_menu():
     print(f"\n{Fore.RED}[MAIN MENU]{Style.RESET_ALL}")
     print(f"{Fore.RED}1. Scan single target{Style.RESET_ALL}")
@@ -36,45 +42,138 @@ def show_menu():
     choice = input(f"\n{Fore.RED}[?] Select option: {Style.RESET_ALL}")
     return choice
 
-def main():
+# Options that take no value
+FLAGS = {'quiet'}
+
+def parse_options(args):
+    options = {}
+    positional = []
+    i = 0
+    while i < len(args):
+        if args[i].startswith('--') and args[i][2:] in FLAGS:
+            options[args[i][2:]] = True
+            i += 1
+        elif args[i].startswith('--') and i + 1 < len(args):
+            options[args[i][2:]] = args[i + 1]
+            i += 2
+        else:
+            positional.append(args[i])
+            i += 1
+    return positional, options
+
+def create_scanner(options):
+    rate = float(options.get('rate', 3))
+    return XvoidSQLScanner(
+        concurrency=int(options.get('concurrency', 4)),
+        rate_limit=rate if rate > 0 else None,
+        timing_concurrency=int(options.get('timing-concurrency', 2)),
+        stop_confidence=float(options.get('confidence', 0.95)),
+        param_mode=options.get('params', 'discover'),
+        pipeline_depth=int(options.get('pipeline', 0)),
+        timings=options.get('timings'),
+        quiet=bool(options.get('quiet')),
+        jsonl=options.get('jsonl'),
+        dns_ttl=float(options.get('dns-ttl', 300))
+    )
+
+def main(options=None):
     print_banner()
     
     # Inisialisasi scanner
-    scanner = XvoidSQLScanner()
+    scanner = create_scanner(options or {})
+    try:
+        run_menu(scanner)
+    except KeyboardInterrupt:
+        print(f"\n{Fore.RED}[!] Interrupted, saving results...{Style.RESET_ALL}")
+    finally:
+        scanner.close()
+
+def scan_targets_file(scanner, file_path, scope_path, workers=2):
+    if not scope_path:
+        raise ScopeError("Scanning a targets file requires an engagement scope file (--scope)")
+    # Same resolver as the scanner's connections, and checked again when they connect
+    scope = Scope.from_file(scope_path, resolve=scanner.dns.resolve)
+    scanner.scope = scope
+    
+    def on_skip(url, reason):
+        scanner.ui.info(f"[-] Skipping {url}: {reason}")
     
+    queue = TargetQueue(scope, workers=workers)
+    stats = queue.run(iter_targets(file_path), scanner.scan_target, on_skip, on_interrupt=scanner.cancel)
+    scanner.ui.info(f"[+] Scanned {stats['scanned']} targets "
+                    f"({stats['out_of_scope']} out of scope, {stats['duplicates']} duplicates)")
+
+def run_scan(scanner, kind, source, resume=None, scope_path=None, workers=2):
+    if kind == 'file' and not scope_path:
+        raise ScopeError("Scanning a targets file requires an engagement scope file (--scope)")
+    kind, source = scanner.start_run(kind, source, resume)
+    scanner.ui.info(f"[+] Run {scanner.run_id} (continue later with --resume {scanner.run_id})")
+    if kind == 'file':
+        scan_targets_file(scanner, source, scope_path, workers)
+    else:
+        scanner.scan_target(source)
+    scanner.finish_run()
+
+def export_results(scanner, fmt, path, options):
+    until = options.get('until')
+    if until and len(until) == 10:
+        until += ' 23:59:59'
+    filters = dict(run_id=int(options['run']) if 'run' in options else None,
+                   target=options.get('target'), since=options.get('since'), until=until)
+    if path == '-':
+        scanner.export_results(fmt, sys.stdout, **filters)
+        return
+    # csv wants newline='' so it controls line endings itself
+    with open(path, 'w', newline='') as out:
+        count = scanner.export_results(fmt, out, **filters)
+    scanner.ui.info(f"[+] Exported {count} findings to {path}")
+
+def run_menu(scanner):
     while True:
         choice = show_menu()
         
         if choice == '1':
             target = input(f"\n{Fore.RED}[?] Enter target URL: {Style.RESET_ALL}")
             print(f"{Fore.RED}[+] Loading payloads and parameters...{Style.RESET_ALL}")
-            scanner.scan_target(target)
+            run_scan(scanner, 'url', target)
             
         elif choice == '2':
             file_path = input(f"\n{Fore.RED}[?] Enter targets file path: {Style.RESET_ALL}")
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    targets = [line.strip() for line in f if line.strip()]
-                
-                print(f"{Fore.RED}[+] Found {len(targets)} targets{Style.RESET_ALL}")
-                for target in targets:
-                    scanner.scan_target(target)
+            scope_path = input(f"{Fore.RED}[?] Enter engagement scope file path: {Style.RESET_ALL}")
+            if os.path.exists(file_path) and os.path.exists(scope_path):
+                try:
+                    run_scan(scanner, 'file', os.path.abspath(file_path), scope_path=scope_path)
+                except ScopeError as e:
+                    print(f"{Fore.RED}[!] {e}{Style.RESET_ALL}")
             else:
                 print(f"{Fore.RED}[!] File not found{Style.RESET_ALL}")
                 
         elif choice == '3':
-            scanner.view_results()
+            print(f"\n{Fore.RED}[FILTERS] Leave blank to show everything{Style.RESET_ALL}")
+            target = input(f"{Fore.RED}[?] Target URL: {Style.RESET_ALL}").strip() or None
+            parameter = input(f"{Fore.RED}[?] Parameter: {Style.RESET_ALL}").strip() or None
+            since = input(f"{Fore.RED}[?] From date (YYYY-MM-DD): {Style.RESET_ALL}").strip() or None
+            until = input(f"{Fore.RED}[?] To date (YYYY-MM-DD): {Style.RESET_ALL}").strip() or None
+            if until and len(until) == 10:
+                until += ' 23:59:59'
+            scanner.view_results(target, parameter, since, until, page_size=20, next_page=prompt_next_page)
             
         elif choice == '4':
             print(f"\n{Fore.RED}[CONFIGURATION]{Style.RESET_ALL}")
-            print(f"{Fore.RED}1. Edit payloads.txt{Style.RESET_ALL}")
-            print(f"{Fore.RED}2. Edit params.txt{Style.RESET_ALL}")
+            print(f"{Fore.RED}1. Edit {os.path.basename(scanner.payloads_file)}{Style.RESET_ALL}")
+            print(f"{Fore.RED}2. Edit {os.path.basename(scanner.params_file)}{Style.RESET_ALL}")
             config_choice = input(f"\n{Fore.RED}[?] Select: {Style.RESET_ALL}")
             
-            if config_choice == '1':
-                os.system('nano payloads.txt' if os.name != 'nt' else 'notepad payloads.txt')
-            elif config_choice == '2':
-                os.system('nano params.txt' if os.name != 'nt' else 'notepad params.txt')
+            editor = 'nano' if os.name != 'nt' else 'notepad'
+            files = {'1': scanner.payloads_file, '2': scanner.params_file}
+            if config_choice in files:
+                try:
+                    subprocess.call([editor, files[config_choice]])
+                except OSError as e:
+                    print(f"{Fore.RED}[!] Could not start {editor}: {e}{Style.RESET_ALL}")
+            
+            # Pick up the edits straight away
+            scanner.load_resources()
                 
         elif choice == '5':
             print(f"\n{Fore.RED}[+] Exiting...{Style.RESET_ALL}")
@@ -84,16 +183,53 @@ def main():
             print(f"{Fore.RED}[!] Invalid choice{Style.RESET_ALL}")
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    args, options = parse_options(sys.argv[1:])
+    if args and args[0] == '-h':
+        print_banner()
+        print(f"\n{Fore.RED}[USAGE]{Style.RESET_ALL}")
+        print(f"{Fore.RED}python main.py -sql <target_url>{Style.RESET_ALL}")
+        print(f"{Fore.RED}python main.py -file <targets_file> --scope <scope_file>{Style.RESET_ALL}")
+        print(f"{Fore.RED}python main.py --resume <run_id>  # Continue an interrupted run{Style.RESET_ALL}")
+        print(f"{Fore.RED}python main.py -export <jsonl|csv|sarif> [file]  # Export findings, stdout without a file{Style.RESET_ALL}")
+        print(f"{Fore.RED}python main.py              # Interactive mode{Style.RESET_ALL}")
+        print(f"\n{Fore.RED}[OPTIONS]{Style.RESET_ALL}")
+        print(f"{Fore.RED}--concurrency <n>           # Probes in flight per target (default 4){Style.RESET_ALL}")
+        print(f"{Fore.RED}--rate <n>                  # Max requests/sec per host, 0 = unlimited (default 3){Style.RESET_ALL}")
+        print(f"{Fore.RED}--timing-concurrency <n>    # Sleep payloads in flight on the timing lane (default 2){Style.RESET_ALL}")
+        print(f"{Fore.RED}--confidence <0-1>          # Stop probing a parameter once this sure, 0 = never (default 0.95){Style.RESET_ALL}")
+        print(f"{Fore.RED}--params <mode>             # discover (from the page), wordlist (params.txt) or both (default discover){Style.RESET_ALL}")
+        print(f"{Fore.RED}--pipeline <n>              # Pipeline up to n probes per connection, 0 = off (default 0){Style.RESET_ALL}")
+        print(f"{Fore.RED}--timings <summary|file>    # Per-phase probe timings as a table, or appended to a JSON lines file{Style.RESET_ALL}")
+        print(f"{Fore.RED}--dns-ttl <seconds>         # How long resolved addresses are reused (default 300){Style.RESET_ALL}")
+        print(f"{Fore.RED}--quiet                     # No progress or banners, only warnings and findings{Style.RESET_ALL}")
+        print(f"{Fore.RED}--jsonl <file|->            # Stream findings as JSON lines to a file, or stdout with -{Style.RESET_ALL}")
+        print(f"{Fore.RED}--scope <file>              # Allowed hosts/CIDRs, required for -file{Style.RESET_ALL}")
+        print(f"{Fore.RED}--targets <n>               # Targets scanned in parallel with -file (default 2){Style.RESET_ALL}")
+        print(f"{Fore.RED}--run <id> --target <url> --since <date> --until <date>  # Export filters{Style.RESET_ALL}")
+    elif args or 'resume' in options:
         # Command line mode
-        scanner = XvoidSQLScanner()
-        if sys.argv[1] == '-sql' and len(sys.argv) > 2:
-            print_banner()
-            scanner.scan_target(sys.argv[2])
-        elif sys.argv[1] == '-h':
+        scanner = create_scanner(options)
+        # Keep stdout clean when it carries findings
+        to_stdout = options.get('jsonl') == '-' or (
+            args and args[0] == '-export' and (len(args) < 3 or args[2] == '-'))
+        if not scanner.ui.quiet and not to_stdout:
             print_banner()
-            print(f"\n{Fore.RED}[USAGE]{Style.RESET_ALL}")
-            print(f"{Fore.RED}python main.py -sql <target_url>{Style.RESET_ALL}")
-            print(f"{Fore.RED}python main.py              # Interactive mode{Style.RESET_ALL}")
+        try:
+            scope_path = options.get('scope')
+            workers = int(options.get('targets', 2))
+            if 'resume' in options:
+                run_scan(scanner, None, None, int(options['resume']), scope_path, workers)
+            elif args[0] == '-sql' and len(args) > 1:
+                run_scan(scanner, 'url', args[1])
+            elif args[0] == '-file' and len(args) > 1:
+                run_scan(scanner, 'file', os.path.abspath(args[1]), None, scope_path, workers)
+            elif args[0] == '-export' and len(args) > 1:
+                export_results(scanner, args[1], args[2] if len(args) > 2 else '-', options)
+        except KeyboardInterrupt:
+            scanner.ui.warn("[!] Interrupted, saving results...")
+        except (ValueError, OSError) as e:
+            scanner.ui.warn(f"[!] {e}")
+        finally:
+            scanner.close()
     else:
-        main()
+        main(options)
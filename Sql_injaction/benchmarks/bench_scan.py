@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# End-to-end scanner benchmark against benchmarks/vulnerable_app.py.
+# Prints one JSON object; --output appends it to a JSON lines file so
+# results can be compared over time.
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+from sql_inject import XvoidSQLScanner
+from vulnerable_app import VULNERABLE, SAFE
+
+def start_app(latency, size):
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, 'vulnerable_app.py'), '--latency', str(latency), '--size', str(size)],
+        stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith('listening'):
+        proc.kill()
+        raise RuntimeError("vulnerable_app.py did not start")
+    return proc, int(line.split()[1])
+
+def percentile(values, fraction):
+    # Nearest-rank percentile
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def scan(base_url, args):
+    latencies = []
+    findings = set()
+    scanner = XvoidSQLScanner(concurrency=args.concurrency, rate_limit=None,
+                              pipeline_depth=args.pipeline, param_mode=args.params)
+    probe = scanner.engine.probe
+
+    def timed_probe(url, param, payload):
+        started = time.perf_counter()
+        result = probe(url, param, payload)
+        latencies.append(time.perf_counter() - started)
+        return result
+
+    scanner.engine.probe = timed_probe
+    started = time.perf_counter()
+    try:
+        for path, _ in VULNERABLE + SAFE:
+            for param, _, _, _ in scanner.scan_target(base_url + path):
+                findings.add((path, param))
+        scanner.finish_run()
+    finally:
+        scanner.close()
+    return findings, latencies, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XvoidSQLScanner against a local vulnerable app")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the app adds to every response")
+    parser.add_argument('--size', type=int, default=0, help="pad app responses to this many bytes")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--pipeline', type=int, default=0)
+    parser.add_argument('--params', default='discover', choices=['discover', 'wordlist', 'both'])
+    parser.add_argument('--output', help="append the JSON result to this file")
+    args = parser.parse_args()
+
+    proc, port = start_app(args.latency, args.size)
+    cwd = os.getcwd()
+    try:
+        # The scanner keeps its database in the working directory; start
+        # from an empty one so payload history doesn't carry over
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            try:
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    findings, latencies, elapsed = scan(f"http://127.0.0.1:{port}", args)
+            finally:
+                os.chdir(cwd)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    expected = set(VULNERABLE)
+    result = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'config': vars(args),
+        'probes': len(latencies),
+        'elapsed_s': round(elapsed, 3),
+        'probes_per_sec': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+            'p99': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        },
+        'peak_rss_kb': peak_rss_kb(),
+        'true_positives': len(findings & expected),
+        'false_positives': len(findings - expected),
+        'false_negatives': len(expected - findings),
+        'false_positive_points': sorted(f"{path}?{param}" for path, param in findings - expected),
+        'missed_points': sorted(f"{path}?{param}" for path, param in expected - findings),
+    }
+    line = json.dumps(result)
+    print(line)
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(line + '\n')
+
+if __name__ == "__main__":
+    main()
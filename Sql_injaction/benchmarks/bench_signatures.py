@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from signatures import SignatureMatcher, load_signatures
+
+SIZES = [64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024]
+
+def synthetic_signatures(count):
+    rng = random.Random(1)
+    dbms = ['MySQL', 'PostgreSQL', 'MSSQL', 'Oracle', 'SQLite']
+    signatures = []
+    for i in range(count):
+        word = ''.join(rng.choice(string.ascii_letters) for _ in range(8))
+        signatures.append((dbms[i % len(dbms)], rf"{word}Exception.{{0,200}}?line \d{{1,6}}"))
+    return signatures
+
+def page(size):
+    # Error-free HTML with the odd trigger word ("warning", "driver", ...),
+    # so every byte goes through the prefilter and nothing matches
+    rng = random.Random(size)
+    words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9))) for _ in range(500)]
+    words += ['error', 'syntax', 'warning', 'driver', 'server', 'select']
+    parts = []
+    total = 0
+    while total < size:
+        part = f"<div class=\"{rng.choice(words)}\">{' '.join(rng.choice(words) for _ in range(12))}</div>\n"
+        parts.append(part)
+        total += len(part)
+    return ''.join(parts)[:size]
+
+def bench(matcher, text, rounds=3):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        matcher.match(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    extra = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    base = load_signatures()
+    for signatures in (base, base + synthetic_signatures(extra)):
+        matcher = SignatureMatcher(signatures)
+        print(f"[{len(signatures)} signatures]")
+        for size in SIZES:
+            elapsed = bench(matcher, page(size))
+            print(f"  {size // 1024:>6} KiB  {elapsed * 1000:8.2f} ms  {elapsed * 1e9 / size:7.1f} ns/byte")
+
+if __name__ == "__main__":
+    main()
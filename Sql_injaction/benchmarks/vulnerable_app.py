@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# Stand-in target for benchmarks: a small shop backed by in-memory SQLite,
+# with endpoints that are injectable on purpose and endpoints that are not.
+# Never expose it beyond localhost.
+import argparse
+import html
+import sqlite3
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+PRODUCTS = [(1, 'keyboard', 25.0), (2, 'mouse', 12.5), (3, 'monitor', 180.0)]
+
+# (path, parameter) pairs that really are injectable
+VULNERABLE = [('/vuln/error', 'id'), ('/vuln/blind', 'id')]
+SAFE = [('/safe/product', 'id'), ('/safe/echo', 'q'), ('/safe/docs', 'topic')]
+
+DOCS = ("<p>If a query fails you may see: You have an error in your SQL syntax; "
+        "check the manual that corresponds to your MySQL server version.</p>")
+
+_local = threading.local()
+
+
+def database():
+    # One in-memory database per server thread, so a SLEEP() on one
+    # request never holds up another
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE products (id INTEGER PRIMARY KEY, name TEXT, price REAL)')
+        conn.executemany('INSERT INTO products VALUES (?, ?, ?)', PRODUCTS)
+        conn.create_function('SLEEP', 1, sleep)
+        _local.conn = conn
+    return conn
+
+
+def sleep(seconds):
+    # MySQL-style SLEEP(); SQLite would call it once per row, the real
+    # thing waits once per query
+    if not _local.slept:
+        _local.slept = True
+        time.sleep(min(float(seconds), 30))
+    return 0
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    size = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        parts = urlsplit(self.path)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        _local.slept = False
+
+        routes = {
+            '/': self.index,
+            '/vuln/error': self.vuln_error,
+            '/vuln/blind': self.vuln_blind,
+            '/safe/product': self.safe_product,
+            '/safe/echo': self.safe_echo,
+            '/safe/docs': self.safe_docs,
+        }
+        route = routes.get(parts.path)
+        if route is None:
+            self.reply(404, "<h1>Not found</h1>")
+        else:
+            self.reply(200, route(query))
+
+    def reply(self, status, content):
+        padding = max(0, self.size - len(content))
+        body = f"<html><body>{content}<div>{'x' * padding}</div></body></html>".encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def index(self, query):
+        links = ''.join(f"<li><a href=\"{path}?{param}=1\">{path}</a></li>"
+                        for path, param in VULNERABLE + SAFE)
+        return f"<ul>{links}</ul>"
+
+    def form(self, path, param, value):
+        return (f"<form action=\"{path}\"><input name=\"{param}\" "
+                f"value=\"{html.escape(value, quote=True)}\"></form>")
+
+    def rows(self, rows):
+        return ''.join(f"<p>{html.escape(str(name))}</p>" for (name,) in rows) or "<p>No results</p>"
+
+    def vuln_error(self, query):
+        value = query.get('id', '1')
+        try:
+            rows = database().execute(f"SELECT name FROM products WHERE id = '{value}'").fetchall()
+        except sqlite3.Error as e:
+            # Leaks the driver error, like a debug page would
+            return f"<pre>sqlite3.{type(e).__name__}: {html.escape(str(e))}</pre>"
+        return self.form('/vuln/error', 'id', value) + self.rows(rows)
+
+    def vuln_blind(self, query):
+        value = query.get('id', '1')
+        try:
+            rows = database().execute(f"SELECT name FROM products WHERE id = '{value}'").fetchall()
+        except sqlite3.Error:
+            rows = []
+        return self.form('/vuln/blind', 'id', value) + self.rows(rows)
+
+    def safe_product(self, query):
+        value = query.get('id', '1')
+        rows = database().execute('SELECT name FROM products WHERE id = ?', (value,)).fetchall()
+        return self.form('/safe/product', 'id', value) + self.rows(rows)
+
+    def safe_echo(self, query):
+        value = query.get('q', '')
+        return self.form('/safe/echo', 'q', value) + f"<p>You searched for {html.escape(value)}</p>"
+
+    def safe_docs(self, query):
+        value = query.get('topic', 'errors')
+        return self.form('/safe/docs', 'topic', value) + DOCS
+
+
+def serve(port=0, latency=0.0, size=0):
+    handler = type('Handler', (Handler,), {'latency': latency, 'size': size})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local vulnerable app for scanner benchmarks")
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--size', type=int, default=0, help="pad responses to this many bytes")
+    args = parser.parse_args()
+
+    server = serve(args.port, args.latency, args.size)
+    # The harness reads the port from this line
+    print(f"listening {server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
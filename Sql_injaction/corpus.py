@@ -0,0 +1,68 @@
+import threading
+from urllib.parse import urlparse, quote
+
+USER_AGENT = "Mozilla/5.0 (X-Void-Scanner/3.0)"
+
+
+class RequestTemplate:
+    def __init__(self, url):
+        parsed = urlparse(url)
+        self.netloc = parsed.netloc
+        self.is_https = parsed.scheme == 'https'
+        self.host = parsed.hostname or parsed.netloc
+        self.port = parsed.port or (443 if self.is_https else 80)
+        path = parsed.path if parsed.path else "/"
+        self.page_line = f"GET {path}{'?' + parsed.query if parsed.query else ''}".encode()
+
+        host_header = parsed.netloc.rsplit('@', 1)[-1]
+        self.prefix = f"GET {path}?".encode()
+        self.suffix = (
+            " HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            f"User-Agent: {USER_AGENT}\r\n"
+            "Accept: */*\r\n"
+            "Accept-Encoding: gzip, deflate\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode()
+
+    def render(self, param, value):
+        # param and value are already URL-encoded bytes
+        return b"".join((self.prefix, param, b"=", value, self.suffix))
+
+    def page(self):
+        # The target URL itself, query string included
+        return self.page_line + self.suffix
+
+
+class Corpus:
+    def __init__(self, params, payloads):
+        self.params = params
+        self.payloads = payloads
+        self.encoded = {value: quote(value).encode('ascii') for value in params + payloads}
+        self.templates = {}
+        self._lock = threading.Lock()
+
+    def encode(self, value):
+        encoded = self.encoded.get(value)
+        if encoded is None:
+            encoded = quote(value).encode('ascii')
+            self.encoded[value] = encoded
+        return encoded
+
+    def template(self, url):
+        template = self.templates.get(url)
+        if template is None:
+            with self._lock:
+                template = self.templates.get(url)
+                if template is None:
+                    template = RequestTemplate(url)
+                    self.templates[url] = template
+        return template
+
+    def forget(self, url):
+        with self._lock:
+            self.templates.pop(url, None)
+
+    def request(self, url, param, value):
+        template = self.template(url)
+        return template, template.render(self.encode(param), self.encode(value))
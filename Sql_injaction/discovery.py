@@ -0,0 +1,56 @@
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, parse_qsl
+
+FIELD_TAGS = ('input', 'select', 'textarea', 'button')
+LINK_ATTRS = {'a': 'href', 'area': 'href', 'frame': 'src', 'iframe': 'src'}
+
+
+def endpoint(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path or '/'}"
+
+
+class InjectionPointParser(HTMLParser):
+    # Collects parameter names per same-host endpoint from query strings,
+    # links and form fields. Fed incrementally, nothing is kept but the names.
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.host = urlsplit(base_url).netloc.lower()
+        self.endpoints = {}
+        self.in_form = False
+        self.form = None
+        self.add_url(base_url)
+
+    def add_url(self, url):
+        url = urljoin(self.base_url, url.strip())
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or parts.netloc.lower() != self.host:
+            return None
+        # dicts keep first-seen order and drop repeats
+        names = self.endpoints.setdefault(endpoint(url), {})
+        for name, _ in parse_qsl(parts.query, keep_blank_values=True):
+            names[name] = None
+        return endpoint(url)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in LINK_ATTRS:
+            if attrs.get(LINK_ATTRS[tag]):
+                self.add_url(attrs[LINK_ATTRS[tag]])
+        elif tag == 'form':
+            self.in_form = True
+            self.form = self.add_url(attrs.get('action') or self.base_url)
+        elif tag in FIELD_TAGS and attrs.get('name'):
+            # Fields outside any form are usually sent by script to the page itself
+            target = self.form if self.in_form else endpoint(self.base_url)
+            if target:
+                self.endpoints[target][attrs['name']] = None
+
+    def handle_endtag(self, tag):
+        if tag == 'form':
+            self.in_form = False
+            self.form = None
+
+    def parameters(self, url):
+        return list(self.endpoints.get(endpoint(url), ()))
@@ -0,0 +1,111 @@
+import csv
+import hashlib
+import json
+
+TOOL_NAME = "X-Void SQL Injection Scanner"
+TOOL_VERSION = "3.0"
+CSV_FIELDS = ['scan_id', 'run_id', 'timestamp', 'target', 'parameter', 'payload', 'dbms', 'vulnerable', 'exploits']
+
+SARIF_RULE = {
+    'id': 'sql-injection',
+    'name': 'SqlInjection',
+    'shortDescription': {'text': 'SQL injection'},
+    'fullDescription': {'text': 'A request parameter reaches a SQL query without being escaped or bound.'},
+    'helpUri': 'https://cwe.mitre.org/data/definitions/89.html',
+    'properties': {'tags': ['security', 'CWE-89']},
+}
+
+
+def iter_findings(conn, clauses=(), args=()):
+    # One dict per scan row, with its exploits attached. Rows come straight
+    # off the cursor in id order, so memory use doesn't grow with the table.
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cursor = conn.execute(f'''SELECT s.id, s.run_id, s.timestamp, s.target, s.parameter, s.payload,
+                                     s.dbms, s.vulnerable, e.type, e.exploit_url
+                              FROM scans s
+                              LEFT JOIN exploits e ON e.scan_id = s.id
+                              {where}
+                              ORDER BY s.id''', args)
+    finding = None
+    for scan_id, run_id, timestamp, target, parameter, payload, dbms, vulnerable, kind, url in cursor:
+        if finding is None or finding['scan_id'] != scan_id:
+            if finding is not None:
+                yield finding
+            finding = {
+                'scan_id': scan_id,
+                'run_id': run_id,
+                'timestamp': timestamp,
+                'target': target,
+                'parameter': parameter,
+                'payload': payload,
+                'dbms': dbms,
+                'vulnerable': bool(vulnerable),
+                'exploits': [],
+            }
+        if url:
+            finding['exploits'].append({'type': kind, 'url': url})
+    if finding is not None:
+        yield finding
+
+
+def write_jsonl(findings, out):
+    count = 0
+    for finding in findings:
+        out.write(json.dumps(finding) + '\n')
+        count += 1
+    return count
+
+
+def write_csv(findings, out):
+    writer = csv.writer(out)
+    writer.writerow(CSV_FIELDS)
+    count = 0
+    for finding in findings:
+        row = [finding[field] for field in CSV_FIELDS[:-1]]
+        # Exploit URLs aren't always percent-encoded, so one per line in the cell
+        row.append('\n'.join(exploit['url'] for exploit in finding['exploits']))
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def sarif_result(finding):
+    dbms = f" ({finding['dbms']})" if finding['dbms'] else ""
+    # Same target and parameter give the same fingerprint across runs,
+    # so a ticketing system can tell new findings from known ones
+    key = f"{finding['target']}|{finding['parameter']}".encode()
+    result = {
+        'ruleId': SARIF_RULE['id'],
+        'level': 'error' if finding['vulnerable'] else 'note',
+        'message': {'text': f"SQL injection in parameter '{finding['parameter']}'{dbms}"},
+        'locations': [{'physicalLocation': {'artifactLocation': {'uri': finding['target']}}}],
+        'partialFingerprints': {'targetParameter/v1': hashlib.sha256(key).hexdigest()},
+        'properties': {field: finding[field] for field in
+                       ('scan_id', 'run_id', 'timestamp', 'parameter', 'payload', 'dbms', 'exploits')},
+    }
+    if finding['exploits']:
+        result['webRequest'] = {'method': 'GET', 'target': finding['exploits'][0]['url']}
+    return result
+
+
+def write_sarif(findings, out):
+    # A SARIF log is one JSON document; the results array is written an
+    # element at a time between a fixed header and footer
+    tool = {'driver': {'name': TOOL_NAME, 'version': TOOL_VERSION, 'rules': [SARIF_RULE]}}
+    out.write('{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", "version": "2.1.0", '
+              f'"runs": [{{"tool": {json.dumps(tool)}, "results": [\n')
+    count = 0
+    for finding in findings:
+        if count:
+            out.write(',\n')
+        out.write(json.dumps(sarif_result(finding)))
+        count += 1
+    out.write('\n]}]}\n')
+    return count
+
+
+EXPORTERS = {
+    'jsonl': write_jsonl,
+    'csv': write_csv,
+    'sarif': write_sarif,
+}
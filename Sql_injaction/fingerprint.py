@@ -0,0 +1,58 @@
+import hashlib
+import html
+import re
+from urllib.parse import quote, quote_plus
+
+TOKEN_RE = re.compile(r'</?[a-zA-Z][a-zA-Z0-9]*|\w+')
+SHINGLE_SIZE = 4
+SKETCH_SIZE = 64
+MAX_TOKENS = 4096
+
+
+def strip_reflection(text, value):
+    # Drop echoes of the submitted value so a reflected payload alone does
+    # not count as a changed page
+    if not value:
+        return text
+    for variant in {value, quote(value), quote_plus(value), html.escape(value)}:
+        text = text.replace(variant, '')
+    return text
+
+
+class PageFingerprint:
+    def __init__(self, status, text):
+        self.status = status
+        self.length = len(text)
+        self.digest = hashlib.blake2b(text.encode('utf-8', errors='ignore'), digest_size=16).digest()
+
+        tokens = TOKEN_RE.findall(text)[:MAX_TOKENS]
+        shingles = {
+            hash(tuple(tokens[i:i + SHINGLE_SIZE]))
+            for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1))
+        }
+        # Bottom-k sketch: a fixed-size sample that still estimates Jaccard
+        self.sketch = frozenset(sorted(shingles)[:SKETCH_SIZE])
+
+    def similarity(self, other):
+        if self.digest == other.digest:
+            return 1.0
+        if self.status != other.status:
+            return 0.0
+        union = sorted(self.sketch | other.sketch)[:SKETCH_SIZE]
+        if not union:
+            return 1.0
+        shared = sum(1 for h in union if h in self.sketch and h in other.sketch)
+        longest = max(self.length, other.length)
+        length_ratio = min(self.length, other.length) / longest if longest else 1.0
+        return min(shared / len(union), length_ratio)
+
+
+class Baseline:
+    def __init__(self, first, second, errors=()):
+        self.fingerprint = first
+        self.stability = first.similarity(second)
+        self.static = first.digest == second.digest
+        self.errors = set(errors)
+
+    def changed(self, fingerprint, margin=0.1):
+        return fingerprint.similarity(self.fingerprint) < self.stability - margin
@@ -0,0 +1,413 @@
+import socket
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future
+
+
+class HTTPResponse:
+    def __init__(self, status, headers, body, keep_alive, truncated=False):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.keep_alive = keep_alive
+        # The body went over the byte budget and the rest was left unread
+        self.truncated = truncated
+
+
+class BodySink:
+    def __init__(self, budget, size_hint=None):
+        if size_hint is None:
+            size_hint = 65536
+        self.data = bytearray(min(budget, size_hint))
+        self.length = 0
+        self.budget = budget
+        self.truncated = False
+
+    def write(self, chunk):
+        room = self.budget - self.length
+        if len(chunk) > room:
+            chunk = chunk[:room]
+            self.truncated = True
+        end = self.length + len(chunk)
+        if end > len(self.data):
+            self.data.extend(bytes(max(end, 2 * len(self.data)) - len(self.data)))
+        self.data[self.length:end] = chunk
+        self.length = end
+
+    def getvalue(self):
+        return bytes(memoryview(self.data)[:self.length])
+
+
+class DecodingSink:
+    # Inflates a gzip/deflate body on its way into `sink`. Each write is
+    # inflated to at most the room left in the sink's budget, so a small
+    # compressed response can't expand into unbounded memory.
+    def __init__(self, sink, encoding):
+        self.sink = sink
+        self.encoding = encoding
+        self.decoder = None
+        self.wire = 0
+
+    @property
+    def truncated(self):
+        return self.sink.truncated
+
+    def _wbits(self, chunk):
+        if self.encoding != 'deflate':
+            return 16 + zlib.MAX_WBITS
+        # "deflate" is meant to be zlib-wrapped, but some servers send it raw
+        if len(chunk) >= 2 and chunk[0] & 0x0f == 8 and (chunk[0] << 8 | chunk[1]) % 31 == 0:
+            return zlib.MAX_WBITS
+        return -zlib.MAX_WBITS
+
+    def write(self, chunk):
+        self.wire += len(chunk)
+        if self.decoder is None:
+            self.decoder = zlib.decompressobj(self._wbits(chunk))
+        room = self.sink.budget - self.sink.length
+        try:
+            # One byte past the room is enough for the sink to notice the overflow
+            self.sink.write(self.decoder.decompress(chunk, room + 1))
+        except zlib.error:
+            # Keep what decoded so far and stop reading
+            self.sink.truncated = True
+        if self.wire > self.sink.budget:
+            self.sink.truncated = True
+
+    def getvalue(self):
+        if self.decoder is not None and not self.sink.truncated:
+            try:
+                self.sink.write(self.decoder.flush())
+            except zlib.error:
+                pass
+        return self.sink.getvalue()
+
+
+def body_sink(budget, size_hint, encoding):
+    sink = BodySink(budget, size_hint)
+    if encoding in ('gzip', 'x-gzip', 'deflate'):
+        return DecodingSink(sink, 'deflate' if encoding == 'deflate' else 'gzip')
+    return sink
+
+
+class ResponseReader:
+    def __init__(self, sock, buffer_size=65536):
+        self.sock = sock
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.start = 0
+        self.end = 0
+
+    def _fill(self):
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif self.end == len(self.buffer):
+            if self.start == 0:
+                raise ValueError("Header line exceeds read buffer")
+            size = self.end - self.start
+            self.view[:size] = bytes(self.view[self.start:self.end])
+            self.start, self.end = 0, size
+        received = self.sock.recv_into(self.view[self.end:])
+        if not received:
+            return False
+        self.end += received
+        return True
+
+    def _take(self, size):
+        # Returns a view into the read buffer; callers must copy it before
+        # the next _fill() overwrites it
+        if self.start == self.end and not self._fill():
+            raise ConnectionError("Connection closed before end of body")
+        count = min(size, self.end - self.start)
+        chunk = self.view[self.start:self.start + count]
+        self.start += count
+        return chunk
+
+    def readline(self):
+        while True:
+            idx = self.buffer.find(b"\r\n", self.start, self.end)
+            if idx >= 0:
+                line = bytes(self.view[self.start:idx])
+                self.start = idx + 2
+                return line
+            if not self._fill():
+                raise ConnectionError("Connection closed while reading headers")
+
+    def read_into(self, sink, size):
+        while size > 0 and not sink.truncated:
+            chunk = self._take(size)
+            sink.write(chunk)
+            size -= len(chunk)
+        return size
+
+    def read_until_close(self, sink):
+        try:
+            while not sink.truncated:
+                if self.start == self.end and not self._fill():
+                    break
+                sink.write(self._take(self.end - self.start))
+        except socket.timeout:
+            pass
+
+    def read_chunked(self, sink):
+        while True:
+            size_line = self.readline().split(b";", 1)[0].strip()
+            size = int(size_line, 16)
+            if size == 0:
+                # Skip trailers up to the terminating blank line
+                while self.readline():
+                    pass
+                return True
+            if self.read_into(sink, size):
+                return False
+            self.readline()
+
+    def read_response(self, max_body=262144, watch=None):
+        while True:
+            status_line = self.readline()
+            while not status_line:
+                status_line = self.readline()
+
+            parts = status_line.decode('latin-1').split(' ', 2)
+            version = parts[0]
+            status = int(parts[1])
+
+            headers = {}
+            while True:
+                line = self.readline()
+                if not line:
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            # Interim responses (100 Continue, 103 Early Hints) have no body
+            # and come before the real one; 101 switches protocols and is final
+            if not 100 <= status < 200 or status == 101:
+                break
+        if watch:
+            watch.lap('ttfb')
+
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.0':
+            keep_alive = connection == 'keep-alive'
+        else:
+            keep_alive = connection != 'close'
+
+        # Anything left unread past the budget makes the socket unusable,
+        # so the connection is dropped instead of downloading the rest.
+        # Compressed bodies are inflated as they arrive; the budget applies
+        # to both the compressed and the inflated size.
+        encoding = headers.get('content-encoding', '').lower()
+        if status < 200 or status in (204, 304):
+            sink = BodySink(max_body, 0)
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            sink = body_sink(max_body, None, encoding)
+            keep_alive = self.read_chunked(sink) and keep_alive
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            sink = body_sink(max_body, length, encoding)
+            keep_alive = self.read_into(sink, length) == 0 and keep_alive
+        else:
+            sink = body_sink(max_body, None, encoding)
+            self.read_until_close(sink)
+            keep_alive = False
+
+        if watch:
+            watch.lap('body')
+        return HTTPResponse(status, headers, sink.getvalue(), keep_alive, sink.truncated)
+
+
+class PooledConnection:
+    def __init__(self, key, sock):
+        self.key = key
+        self.sock = sock
+        self.reader = ResponseReader(sock)
+        self.requests = 0
+        self.last_used = time.monotonic()
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class ConnectionPool:
+    def __init__(self, connect, max_per_host=4, idle_timeout=30, on_release=None, phases=None):
+        self.connect = connect
+        self.on_release = on_release
+        # Optional PhaseRecorder for ttfb/body timings
+        self.phases = phases
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._open = {}
+        self._cond = threading.Condition()
+        self.no_pipeline = set()
+
+    def _evict_idle(self, key):
+        idle = self._idle.get(key)
+        if not idle:
+            return
+        now = time.monotonic()
+        while idle and now - idle[0].last_used > self.idle_timeout:
+            conn = idle.popleft()
+            conn.close()
+            self._open[key] -= 1
+
+    def acquire(self, host, port, is_https):
+        key = (host, port, is_https)
+        with self._cond:
+            while True:
+                self._evict_idle(key)
+                idle = self._idle.get(key)
+                if idle:
+                    return idle.pop()
+                if self._open.get(key, 0) < self.max_per_host:
+                    self._open[key] = self._open.get(key, 0) + 1
+                    break
+                self._cond.wait()
+
+        try:
+            sock = self.connect(host, port, is_https)
+        except Exception:
+            with self._cond:
+                self._open[key] -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(key, sock)
+
+    def release(self, conn, reusable=True):
+        if self.on_release and conn.requests:
+            self.on_release(conn)
+        with self._cond:
+            if reusable:
+                conn.last_used = time.monotonic()
+                self._idle.setdefault(conn.key, deque()).append(conn)
+            else:
+                conn.close()
+                self._open[conn.key] -= 1
+            self._cond.notify()
+
+    def request(self, host, port, is_https, data, max_body=262144):
+        # Every idle socket may be stale, so keep going until a fresh one is tried
+        for attempt in range(self.max_per_host + 1):
+            conn = self.acquire(host, port, is_https)
+            reused = conn.requests > 0
+            watch = self.phases.stopwatch() if self.phases else None
+            try:
+                conn.sock.sendall(data)
+                response = conn.reader.read_response(max_body, watch)
+            except socket.timeout:
+                # A slow server is not a stale socket; retrying would double the wait
+                self.release(conn, reusable=False)
+                raise
+            except (OSError, ValueError):
+                self.release(conn, reusable=False)
+                # A reused socket may have been closed by the server while idle
+                if reused and attempt < self.max_per_host:
+                    continue
+                raise
+            conn.requests += 1
+            self.release(conn, reusable=response.keep_alive)
+            return response
+
+    def pipeline(self, host, port, is_https, requests, max_body=262144):
+        # Writes every request before reading any response and returns the
+        # responses that came back, in order, and whether the unanswered
+        # rest may be sent again one at a time. They may not when a body was
+        # cut off: the server has them all, only their responses are unread.
+        key = (host, port, is_https)
+        responses = []
+        if key in self.no_pipeline:
+            return responses, True
+        conn = self.acquire(host, port, is_https)
+        reused = conn.requests > 0
+        reusable = False
+        try:
+            conn.sock.sendall(b"".join(requests))
+            for _ in requests:
+                response = conn.reader.read_response(max_body)
+                responses.append(response)
+                conn.requests += 1
+                if response.truncated and len(responses) < len(requests):
+                    # Pages this big would be cut off again; stop pipelining here
+                    self.no_pipeline.add(key)
+                    return responses, False
+                if not response.keep_alive:
+                    break
+            reusable = responses[-1].keep_alive
+        except (OSError, ValueError):
+            # A fresh connection that breaks mid-pipeline means the server
+            # can't take pipelined requests; a stale reused one proves nothing
+            if responses or not reused:
+                self.no_pipeline.add(key)
+        finally:
+            self.release(conn, reusable)
+        return responses, True
+
+    def close_all(self):
+        with self._cond:
+            for key, idle in self._idle.items():
+                while idle:
+                    idle.pop().close()
+                    self._open[key] -= 1
+            self._cond.notify_all()
+
+
+class PipelineBatcher:
+    # Requests that arrive for the same host within `window` seconds are
+    # sent as one pipeline of up to `depth` requests. The first caller of a
+    # batch sends it; the others wait for their own response.
+    def __init__(self, pool, depth=8, window=0.002):
+        self.pool = pool
+        self.depth = depth
+        self.window = window
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def request(self, host, port, is_https, data, max_body=262144):
+        key = (host, port, is_https)
+        future = Future()
+        with self._lock:
+            batch = self._batches.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._batches[key] = ([], threading.Event())
+            items, full = batch
+            items.append((data, future))
+            if len(items) >= self.depth:
+                del self._batches[key]
+                full.set()
+
+        if leader:
+            full.wait(self.window)
+            with self._lock:
+                if self._batches.get(key) is batch:
+                    del self._batches[key]
+            self._send(key, items, max_body)
+        return future.result()
+
+    def _send(self, key, items, max_body):
+        responses = []
+        resend = True
+        if len(items) > 1:
+            try:
+                responses, resend = self.pool.pipeline(*key, [data for data, _ in items], max_body)
+            except Exception:
+                responses = []
+        for (_, future), response in zip(items, responses):
+            future.set_result(response)
+        if not resend:
+            # The server already handled these; sending them again would
+            # double the requests and go past the rate limit
+            for _, future in items[len(responses):]:
+                future.set_exception(ConnectionError("Response lost behind a truncated pipelined response"))
+            return
+        # Anything the pipeline didn't answer goes over plain keep-alive
+        for data, future in items[len(responses):]:
+            try:
+                future.set_result(self.pool.request(*key, data, max_body))
+            except Exception as e:
+                future.set_exception(e)
@@ -0,0 +1,107 @@
+import json
+import math
+import threading
+import time
+
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'body', 'match', 'db')
+
+
+class Histogram:
+    # Power-of-two buckets over microseconds: one dict update per sample
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        bucket = int(seconds * 1e6).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, fraction):
+        # Upper edge of the bucket holding the rank, so at most 2x high
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.50) * 1000, 3),
+            'p90_ms': round(self.percentile(0.90) * 1000, 3),
+            'p99_ms': round(self.percentile(0.99) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+            # Bucket n holds samples under 2**n microseconds
+            'buckets_us': {str(1 << bucket): count for bucket, count in sorted(self.buckets.items())},
+        }
+
+
+class Stopwatch:
+    def __init__(self, recorder, target):
+        self.recorder = recorder
+        self.target = target
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        # Records the time since the previous lap (or since creation)
+        now = time.perf_counter()
+        self.recorder.add(self.target, phase, now - self.last)
+        self.last = now
+
+
+class PhaseRecorder:
+    def __init__(self):
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def begin(self, target):
+        # Connection-level phases don't know the target; they use whatever
+        # this thread is currently fetching for
+        self._local.target = target
+
+    def stopwatch(self, target=None):
+        return Stopwatch(self, target or getattr(self._local, 'target', None))
+
+    def add(self, target, phase, seconds):
+        with self._lock:
+            phases = self._targets.setdefault(target, {})
+            histogram = phases.get(phase)
+            if histogram is None:
+                histogram = phases[phase] = Histogram()
+            histogram.add(seconds)
+
+    def pop(self, target):
+        with self._lock:
+            return self._targets.pop(target, {})
+
+
+def summary_lines(histograms):
+    lines = [f"{'phase':<8} {'count':>7} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'total s':>9}"]
+    for phase in PHASES:
+        histogram = histograms.get(phase)
+        if histogram is None:
+            continue
+        lines.append(f"{phase:<8} {histogram.count:>7} {histogram.total / histogram.count * 1000:>9.2f} "
+                     f"{histogram.percentile(0.50) * 1000:>9.2f} {histogram.percentile(0.99) * 1000:>9.2f} "
+                     f"{histogram.max * 1000:>9.2f} {histogram.total:>9.2f}")
+    return lines
+
+
+def write_jsonl(path, target, histograms):
+    with open(path, 'a') as f:
+        for phase in PHASES:
+            if phase in histograms:
+                record = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'target': target, 'phase': phase}
+                record.update(histograms[phase].as_dict())
+                f.write(json.dumps(record) + '\n')
@@ -0,0 +1,108 @@
+import json
+import sys
+import threading
+import time
+from colorama import Fore, Style
+
+
+class Renderer:
+    # All scan output goes through here. Progress is only counted on the
+    # hot path and redrawn at most every `refresh` seconds.
+    def __init__(self, quiet=False, jsonl=None, refresh=0.2):
+        self.quiet = quiet
+        self.refresh = refresh
+        self.out = sys.stdout
+        self.findings = None
+        if jsonl == '-':
+            # Findings own stdout; people get stderr
+            self.findings = sys.stdout
+            self.out = sys.stderr
+        elif jsonl:
+            self.findings = open(jsonl, 'a')
+        self._progress = {}
+        self._drawn = 0
+        self._last_draw = 0.0
+        self._lock = threading.Lock()
+
+    def _clear(self):
+        if self._drawn:
+            self.out.write('\r' + ' ' * self._drawn + '\r')
+            self._drawn = 0
+
+    def _print(self, lines):
+        with self._lock:
+            self._clear()
+            for line in lines:
+                print(f"{Fore.RED}{line}{Style.RESET_ALL}", file=self.out)
+
+    def info(self, *lines):
+        if not self.quiet:
+            self._print(lines)
+
+    def warn(self, *lines):
+        self._print(lines)
+
+    def start(self, target, total):
+        with self._lock:
+            self._progress[target] = [0, total, '']
+
+    def advance(self, target, label):
+        state = self._progress.get(target)
+        if state is None:
+            return
+        state[0] += 1
+        state[2] = label
+        if self.quiet:
+            return
+        now = time.monotonic()
+        if now - self._last_draw >= self.refresh:
+            self._draw(now)
+
+    def _draw(self, now):
+        with self._lock:
+            self._last_draw = now
+            if len(self._progress) == 1:
+                done, total, label = next(iter(self._progress.values()))
+                line = f"[{done}/{total}] {label}"
+            else:
+                done = sum(state[0] for state in self._progress.values())
+                total = sum(state[1] for state in self._progress.values())
+                line = f"[{len(self._progress)} targets] {done}/{total} probes"
+            line = line[:100]
+            self._clear()
+            self.out.write(f"{Fore.RED}{line}{Style.RESET_ALL}\r")
+            self.out.flush()
+            self._drawn = len(line)
+
+    def finish(self, target):
+        with self._lock:
+            self._progress.pop(target, None)
+            self._clear()
+
+    def finding(self, target, param, payload, result, run_id=None):
+        if self.findings:
+            record = {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'run_id': run_id,
+                'target': target,
+                'parameter': param,
+                'payload': payload,
+                'dbms': result.dbms,
+                'technique': result.technique,
+                'evidence': result.evidence,
+            }
+            with self._lock:
+                self.findings.write(json.dumps(record) + '\n')
+                self.findings.flush()
+        # Findings are shown even with --quiet, which only hides progress and banners
+        self.warn(f"[!] VULNERABLE! Parameter: {param}",
+                  f"[!] Payload: {payload}",
+                  f"[!] DBMS: {result.dbms} ({result.evidence[:60]})",
+                  f"[!] Response snippet: {result.response[:100]}...")
+
+    def close(self):
+        with self._lock:
+            self._clear()
+            if self.findings and self.findings is not sys.stdout:
+                self.findings.close()
+            self.findings = None
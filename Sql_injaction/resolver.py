@@ -0,0 +1,127 @@
+import errno
+import os
+import selectors
+import socket
+import threading
+import time
+
+CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+
+def interleave(infos):
+    # RFC 8305 order: keep the OS preference inside each family, but
+    # alternate families starting with the one the OS put first
+    by_family = {}
+    for family, _, _, _, sockaddr in infos:
+        addresses = by_family.setdefault(family, [])
+        if (family, sockaddr) not in addresses:
+            addresses.append((family, sockaddr))
+    queues = list(by_family.values())
+    ordered = []
+    while any(queues):
+        for queue in queues:
+            if queue:
+                ordered.append(queue.pop(0))
+    return ordered
+
+
+class DNSCache:
+    # getaddrinfo doesn't expose record TTLs, so answers are kept for a
+    # fixed `ttl`; failures are remembered briefly so a dead name isn't
+    # looked up again by every probe
+    def __init__(self, ttl=300, negative_ttl=5):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _lookup_lock(self, key):
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _cached(self, key):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            if isinstance(entry[1], Exception):
+                raise entry[1]
+            return entry[1]
+        return None
+
+    def resolve(self, host, port):
+        key = (host, port)
+        addresses = self._cached(key)
+        if addresses is not None:
+            return addresses
+        # One lookup per name at a time; the other threads wait and reuse it
+        with self._lookup_lock(key):
+            addresses = self._cached(key)
+            if addresses is not None:
+                return addresses
+            try:
+                infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except socket.gaierror as e:
+                self._entries[key] = (time.monotonic() + self.negative_ttl, e)
+                raise
+            addresses = interleave(infos)
+            self._entries[key] = (time.monotonic() + self.ttl, addresses)
+            return addresses
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def connect_fastest(addresses, timeout=10, stagger=0.25):
+    # Happy Eyeballs: start the next address whenever the current attempts
+    # have had `stagger` seconds (or one fails), keep the first to connect
+    selector = selectors.DefaultSelector()
+    remaining = list(addresses)
+    pending = []
+    errors = []
+    winner = None
+    deadline = time.monotonic() + timeout
+    next_start = time.monotonic()
+    try:
+        while winner is None:
+            now = time.monotonic()
+            if now >= deadline:
+                raise socket.timeout("Connect timed out")
+            if remaining and (now >= next_start or not pending):
+                family, sockaddr = remaining.pop(0)
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                code = sock.connect_ex(sockaddr)
+                if code and code not in CONNECT_IN_PROGRESS:
+                    errors.append(OSError(code, f"{os.strerror(code)} ({sockaddr[0]})"))
+                    sock.close()
+                    continue
+                selector.register(sock, selectors.EVENT_WRITE, sockaddr[0])
+                pending.append(sock)
+                next_start = now + stagger
+                continue
+            if not pending:
+                raise errors[-1] if errors else OSError("No addresses to connect to")
+
+            wait = (min(next_start, deadline) if remaining else deadline) - now
+            for key, _ in selector.select(max(wait, 0)):
+                sock = key.fileobj
+                selector.unregister(sock)
+                pending.remove(sock)
+                code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if code == 0:
+                    winner = sock
+                    break
+                errors.append(OSError(code, f"{os.strerror(code)} ({key.data})"))
+                sock.close()
+                # A failure hands over to the next address straight away
+                next_start = now
+    finally:
+        for sock in pending:
+            sock.close()
+        selector.close()
+    winner.setblocking(True)
+    return winner
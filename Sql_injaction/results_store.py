@@ -0,0 +1,149 @@
+import atexit
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+def resolve(value):
+    # Jobs run in submission order, so a Future handed in from an earlier
+    # job has always run by the time a later job looks at it. Within the
+    # same batch it isn't settled until the commit, so the job's outcome is
+    # read from the Future directly.
+    if isinstance(value, Future):
+        if not value.done() and hasattr(value, 'outcome'):
+            result, error = value.outcome
+            if error is not None:
+                raise error
+            return result
+        return value.result()
+    return value
+
+
+class ResultStore:
+    def __init__(self, db_name, batch_size=200):
+        self.db_name = db_name
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='xvoid-results', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_name)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _run(self):
+        conn = self._connect()
+        cursor = conn.cursor()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            waiters = []
+            futures = []
+            stop = False
+            # Set when the transaction itself is lost; every job in the
+            # batch then fails with it
+            failure = None
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, tuple):
+                    job, future = item
+                    futures.append(future)
+                    if failure is not None:
+                        future.outcome = (None, failure)
+                        continue
+                    try:
+                        if not conn.in_transaction:
+                            cursor.execute('BEGIN')
+                        # A job that fails halfway leaves none of its writes behind
+                        cursor.execute('SAVEPOINT job')
+                        try:
+                            future.outcome = (job(cursor), None)
+                        except Exception as e:
+                            future.outcome = (None, e)
+                            try:
+                                cursor.execute('ROLLBACK TO job')
+                            except sqlite3.Error:
+                                # SQLITE_FULL, SQLITE_IOERR and the like roll
+                                # back the whole transaction, savepoint included
+                                failure = e
+                                continue
+                        cursor.execute('RELEASE job')
+                    except Exception as e:
+                        future.outcome = (None, e)
+                        failure = e
+                else:
+                    waiters.append(item)
+
+            # One commit (and one fsync) for everything drained this round.
+            # Futures are only settled once it's known whether that worked.
+            if failure is None:
+                try:
+                    conn.commit()
+                except sqlite3.Error as e:
+                    failure = e
+            if failure is not None:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    pass
+                for future in futures:
+                    if future.outcome[1] is None:
+                        future.outcome = (None, failure)
+            for future in futures:
+                result, error = future.outcome
+                del future.outcome
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                conn.close()
+                return
+
+    def _check_writer(self):
+        if not self._thread.is_alive():
+            raise RuntimeError("Result store writer has stopped")
+
+    def submit(self, job):
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Result store is closed")
+            self._check_writer()
+            self._queue.put((job, future))
+        return future
+
+    def flush(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._check_writer()
+            done = threading.Event()
+            self._queue.put(done)
+        # Don't wait forever on a writer that died with the event queued
+        while not done.wait(0.5):
+            self._check_writer()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst else max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        # Take a token now and return how long the caller must wait for it.
+        # Tokens may go negative so concurrent callers queue up fairly.
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ScanEngine:
+    def __init__(self, probe, concurrency=8, rate_limit=None, slow_concurrency=2):
+        self.probe = probe
+        self.concurrency = concurrency
+        self.slow_concurrency = slow_concurrency
+        self.rate_limit = rate_limit
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, host):
+        if not self.rate_limit:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_limit)
+                self._buckets[host] = bucket
+            return bucket
+
+    async def _worker(self, loop, executor, url, bucket, jobs, on_result, probe, skip):
+        for index, job in jobs:
+            if skip and skip(index, job):
+                continue
+            if bucket:
+                await bucket.acquire()
+            result = await loop.run_in_executor(executor, probe, url, *job)
+            on_result(index, job, result)
+
+    async def _run(self, url, host, jobs, on_result, probe, skip, slow_jobs):
+        loop = asyncio.get_running_loop()
+        bucket = self.bucket_for(host)
+        probe = probe or self.probe
+        # Workers in a lane share one iterator, so at most `concurrency`
+        # probes are in flight. Slow jobs (e.g. sleep payloads) get their own
+        # lane so they never hold up the fast ones. Either iterable may be a
+        # generator that decides the next job as results come in.
+        fast_jobs = enumerate(jobs)
+
+        fast_executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        slow_executor = ThreadPoolExecutor(max_workers=self.slow_concurrency)
+        try:
+            workers = [
+                self._worker(loop, fast_executor, url, bucket, fast_jobs, on_result, probe, skip)
+                for _ in range(self.concurrency)
+            ]
+            if slow_jobs is not None:
+                slow_jobs = enumerate(slow_jobs)
+                workers += [
+                    self._worker(loop, slow_executor, url, bucket, slow_jobs, on_result, probe, skip)
+                    for _ in range(self.slow_concurrency)
+                ]
+            await asyncio.gather(*workers)
+        finally:
+            fast_executor.shutdown()
+            slow_executor.shutdown()
+
+    def run(self, url, host, jobs, on_result, probe=None, skip=None, slow_jobs=None):
+        asyncio.run(self._run(url, host, jobs, on_result, probe, skip, slow_jobs))
@@ -0,0 +1,99 @@
+import sqlite3
+import threading
+
+# How sure one finding makes us that a parameter is injectable, by technique
+FINDING_CONFIDENCE = {'error': 0.9, 'time': 0.8}
+
+
+class PayloadStats:
+    def __init__(self):
+        self.attempts = {}
+        self.hits = {}
+        self.dbms_hits = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, db_name):
+        # Attempts come from checkpoints (one per answered probe), hits from
+        # the findings saved in scans
+        stats = cls()
+        conn = sqlite3.connect(db_name)
+        try:
+            for payload, count in conn.execute('''SELECT payload, COUNT(*) FROM checkpoints
+                                                   GROUP BY payload'''):
+                stats.attempts[payload] = count
+            for payload, dbms, count in conn.execute('''SELECT payload, dbms, COUNT(*) FROM scans
+                                                         WHERE vulnerable = 1 GROUP BY payload, dbms'''):
+                stats.hits[payload] = stats.hits.get(payload, 0) + count
+                if dbms:
+                    stats.dbms_hits[(payload, dbms)] = count
+        finally:
+            conn.close()
+        return stats
+
+    def record(self, payload, result):
+        with self._lock:
+            self.attempts[payload] = self.attempts.get(payload, 0) + 1
+            if result.vulnerable:
+                self.hits[payload] = self.hits.get(payload, 0) + 1
+                if result.dbms:
+                    key = (payload, result.dbms)
+                    self.dbms_hits[key] = self.dbms_hits.get(key, 0) + 1
+
+    def score(self, payload, dbms=None):
+        # Laplace-smoothed hit rate, so untried payloads start at 0.5 and
+        # one lucky hit doesn't put a payload on top forever
+        if dbms:
+            hits = self.dbms_hits.get((payload, dbms), 0)
+        else:
+            hits = self.hits.get(payload, 0)
+        # Findings saved before checkpoints existed have no attempt count
+        attempts = max(self.attempts.get(payload, 0), self.hits.get(payload, 0))
+        return (hits + 1) / (attempts + 2)
+
+    def rank(self, payloads, dbms=None):
+        # Stable, so payloads with the same score keep their file order
+        with self._lock:
+            return sorted(payloads, key=lambda payload: -self.score(payload, dbms))
+
+
+class ParamScheduler:
+    def __init__(self, stats, stop_confidence=0.95):
+        self.stats = stats
+        self.stop_confidence = stop_confidence
+        self.confidence = {}
+        self.dbms = None
+        self.stopped = 0
+
+    def done(self, param):
+        return bool(self.stop_confidence) and self.confidence.get(param, 0.0) >= self.stop_confidence
+
+    def jobs(self, params, payloads, completed=()):
+        # Payloads are picked one at a time, so once a finding reveals the
+        # DBMS the rest are re-ranked for it
+        for param in params:
+            remaining = [payload for payload in payloads if (param, payload) not in completed]
+            # Best payload last, so pop() is cheap
+            ranked_for = self.dbms
+            remaining = self.stats.rank(remaining, ranked_for)[::-1]
+            while remaining:
+                if self.done(param):
+                    self.stopped += len(remaining)
+                    break
+                if ranked_for != self.dbms:
+                    ranked_for = self.dbms
+                    remaining = self.stats.rank(remaining, ranked_for)[::-1]
+                yield param, remaining.pop()
+
+    def record(self, param, payload, result):
+        self.stats.record(payload, result)
+        if result.vulnerable:
+            self.restore(param, result.technique, result.dbms)
+
+    def restore(self, param, technique, dbms=None):
+        # Also used for findings saved earlier in a resumed run, so a
+        # parameter confirmed then isn't probed all over again
+        if dbms:
+            self.dbms = dbms
+        weight = FINDING_CONFIDENCE.get(technique, 0.5)
+        self.confidence[param] = 1 - (1 - self.confidence.get(param, 0.0)) * (1 - weight)
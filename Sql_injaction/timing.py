@@ -0,0 +1,70 @@
+import math
+import re
+import threading
+
+DELAY_PATTERNS = [
+    (re.compile(r"WAITFOR\s+DELAY\s+'(\d+):(\d+):(\d+)'", re.IGNORECASE), 'MSSQL'),
+    (re.compile(r"pg_sleep\(\s*(\d+(?:\.\d+)?)\s*\)", re.IGNORECASE), 'PostgreSQL'),
+    (re.compile(r"DBMS_PIPE\.RECEIVE_MESSAGE\([^,]+,\s*(\d+)\s*\)", re.IGNORECASE), 'Oracle'),
+    (re.compile(r"\bSLEEP\(\s*(\d+(?:\.\d+)?)\s*\)", re.IGNORECASE), 'MySQL'),
+]
+
+
+def expected_delay(payload):
+    # Returns (seconds, dbms) for payloads that ask the database to sleep
+    for pattern, dbms in DELAY_PATTERNS:
+        found = pattern.search(payload)
+        if found:
+            if len(found.groups()) == 3:
+                hours, minutes, seconds = (int(g) for g in found.groups())
+                return hours * 3600 + minutes * 60 + seconds, dbms
+            return float(found.group(1)), dbms
+    return None
+
+
+class LatencyStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        # Welford's online update
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class LatencyModel:
+    def __init__(self, min_samples=5, sigmas=4.0, delay_fraction=0.7):
+        self.min_samples = min_samples
+        self.sigmas = sigmas
+        self.delay_fraction = delay_fraction
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def observe(self, host, elapsed):
+        with self._lock:
+            self._hosts.setdefault(host, LatencyStats()).add(elapsed)
+
+    def stats(self, host):
+        with self._lock:
+            return self._hosts.get(host)
+
+    def ready(self, host):
+        stats = self.stats(host)
+        return stats is not None and stats.count >= self.min_samples
+
+    def is_delayed(self, host, elapsed, delay):
+        # The response has to be both an outlier for this host and late by
+        # most of the requested delay
+        stats = self.stats(host)
+        if stats is None or stats.count < self.min_samples:
+            return False
+        threshold = stats.mean + max(self.sigmas * stats.stdev, self.delay_fraction * delay)
+        return elapsed >= threshold
@@ -0,0 +1,43 @@
+import ssl
+import threading
+
+
+class TLSCache:
+    def __init__(self):
+        self._contexts = {}
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _create_context(self, verify, cafile):
+        if verify:
+            return ssl.create_default_context(cafile=cafile)
+        # Nothing is verified, so skip loading the system CA store entirely
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+
+    def context(self, verify=False, cafile=None):
+        key = (verify, cafile)
+        with self._lock:
+            context = self._contexts.get(key)
+            if context is None:
+                context = self._create_context(verify, cafile)
+                self._contexts[key] = context
+            return context
+
+    def wrap(self, sock, host, port, verify=False, cafile=None):
+        context = self.context(verify, cafile)
+        session = self._sessions.get((verify, cafile, host, port))
+        return context.wrap_socket(sock, server_hostname=host, session=session)
+
+    def store(self, sock, host, port, verify=False, cafile=None):
+        # TLS 1.3 tickets arrive after the handshake, so this is called once
+        # the connection has carried a response rather than right after connect
+        session = getattr(sock, 'session', None)
+        if session is not None:
+            self._sessions[(verify, cafile, host, port)] = session
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
@@ -2,13 +2,26 @@
 import sys
 import argparse
 import json
+import concurrent.futures
 from datetime import datetime
 from utils import Banner, Colors, print_success, print_error, print_info, Loading
 from network import NetworkTools
+from resolver import DNSResolver
 
 class XORZTracker:
-    def __init__(self):
-        self.tools = NetworkTools()
+    LABELS = {
+        'geolocation': 'Geolocation',
+        'reverse_dns': 'Reverse DNS',
+        'open_ports': 'Port scan',
+        'resolution': 'Resolving domain',
+        'ip_info': 'Geolocation',
+        'dns_records': 'DNS records',
+        'web_info': 'Web server',
+    }
+    
+    def __init__(self, dns=None):
+        self.tools = NetworkTools(dns)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=8)
         self.last_result = None
     
     def track(self, target):
@@ -19,32 +32,59 @@ class XORZTracker:
         else:
             return self.track_domain(target)
     
+    def _as_completed(self, futures, loading):
+        # Yields (key, value) as each lookup finishes. Futures added to the
+        # dict while iterating are waited on too. The caller's loop body runs
+        # with the spinner held, so its output doesn't mix with it.
+        seen = set()
+        while len(seen) < len(futures):
+            pending = [future for future in futures if future not in seen]
+            for future in pending:
+                if future not in loading.tasks:
+                    loading.track(future, self.LABELS[futures[future]])
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                seen.add(future)
+                with loading.hold():
+                    yield futures[future], future.result()
+    
+    def _ordered(self, results, found, keys):
+        for key in keys:
+            if key in found:
+                results[key] = found[key]
+        return results
+    
     def track_ip(self, ip):
         print(f"{Colors.CYAN}[TARGET]{Colors.RESET} {ip}\n")
         
         results = {'ip': ip, 'timestamp': datetime.now().isoformat()}
         
-        Loading.spin("Getting geolocation", 1)
-        geo = self.tools.get_geolocation(ip)
-        if geo:
-            results['geolocation'] = geo
-            self._display_geolocation(geo)
-        
-        Loading.spin("Reverse DNS lookup", 0.5)
-        reverse = self.tools.reverse_dns_lookup(ip)
-        if reverse:
-            results['reverse_dns'] = reverse
-            self._display_reverse_dns(reverse)
+        futures = {
+            self.executor.submit(self.tools.get_geolocation, ip): 'geolocation',
+            self.executor.submit(self.tools.reverse_dns_lookup, ip): 'reverse_dns',
+            self.executor.submit(self.tools.port_scan, ip): 'open_ports',
+        }
+        displays = {
+            'geolocation': self._display_geolocation,
+            'reverse_dns': self._display_reverse_dns,
+            'open_ports': self._display_ports,
+        }
         
-        print_info("Port scanning started")
+        found = {}
         try:
-            ports = self.tools.port_scan(ip)
-            results['open_ports'] = ports
-            self._display_ports(ports)
+            with Loading() as loading:
+                for key, value in self._as_completed(futures, loading):
+                    if value or key == 'open_ports':
+                        found[key] = value
+                        displays[key](value)
         except KeyboardInterrupt:
-            print(f"\n{Colors.YELLOW}[~] Port scan interrupted{Colors.RESET}")
-            results['open_ports'] = []
+            for future in futures:
+                future.cancel()
+            if 'open_ports' not in found:
+                print(f"\n{Colors.YELLOW}[~] Port scan interrupted{Colors.RESET}")
+                found['open_ports'] = []
         
+        self._ordered(results, found, ('geolocation', 'reverse_dns', 'open_ports'))
         self.last_result = results
         self._save_results(results)
         
@@ -53,39 +93,57 @@ class XORZTracker:
     def track_domain(self, domain):
         print(f"{Colors.CYAN}[TARGET]{Colors.RESET} {domain}\n")
         
-        Loading.spin("Resolving domain", 1)
-        resolution = self.tools.resolve_domain(domain)
+        # DNS records and the web check only need the name, so they start
+        # alongside the resolution; geolocation waits for the primary IP
+        name = self.tools.domain_name(domain)
+        timestamp = datetime.now().isoformat()
+        futures = {
+            self.executor.submit(self.tools.resolve_domain, domain): 'resolution',
+            self.executor.submit(self.tools.get_dns_records, name): 'dns_records',
+            self.executor.submit(self.tools.check_web_info, name): 'web_info',
+        }
+        displays = {
+            'ip_info': self._display_geolocation,
+            'dns_records': self._display_dns_records,
+            'web_info': self._display_web_info,
+        }
         
-        if not resolution:
-            print_error("Failed to resolve domain")
-            return None
+        found = {}
+        waiting = []
+        resolution = None
+        with Loading() as loading:
+            for key, value in self._as_completed(futures, loading):
+                if key == 'resolution':
+                    if not value:
+                        for future in futures:
+                            future.cancel()
+                        print_error("Failed to resolve domain")
+                        return None
+                    resolution = value
+                    print_success(f"Resolved to: {', '.join(resolution['ips'])}")
+                    if resolution['primary_ip']:
+                        futures[self.executor.submit(self.tools.get_geolocation, resolution['primary_ip'])] = 'ip_info'
+                    # Sections that beat the resolution are shown once it succeeded
+                    for section, data in waiting:
+                        displays[section](data)
+                    continue
+                
+                if not value and key != 'dns_records':
+                    continue
+                found[key] = value
+                if key == 'ip_info':
+                    print(f"\n{Colors.YELLOW}[PRIMARY IP]{Colors.RESET} {resolution['primary_ip']}")
+                if resolution:
+                    displays[key](value)
+                else:
+                    waiting.append((key, value))
         
         results = {
             'domain': domain,
             'resolution': resolution,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         }
-        
-        print_success(f"Resolved to: {', '.join(resolution['ips'])}")
-        
-        if resolution['primary_ip']:
-            print(f"\n{Colors.YELLOW}[PRIMARY IP]{Colors.RESET} {resolution['primary_ip']}")
-            ip_info = self.tools.get_geolocation(resolution['primary_ip'])
-            if ip_info:
-                results['ip_info'] = ip_info
-                self._display_geolocation(ip_info)
-        
-        Loading.spin("Getting DNS records", 1)
-        dns_records = self.tools.get_dns_records(resolution['domain'])
-        results['dns_records'] = dns_records
-        self._display_dns_records(dns_records)
-        
-        Loading.spin("Checking web server", 1)
-        web_info = self.tools.check_web_info(resolution['domain'])
-        if web_info:
-            results['web_info'] = web_info
-            self._display_web_info(web_info)
-        
+        self._ordered(results, found, ('ip_info', 'dns_records', 'web_info'))
         self.last_result = results
         self._save_results(results)
         
@@ -93,9 +151,7 @@ class XORZTracker:
     
     def show_my_ip(self):
         Banner.show()
-        Loading.spin("Detecting public IP", 1)
-        
-        ip = self.tools.get_public_ip()
+        ip = Loading.spin("Detecting public IP", self.executor.submit(self.tools.get_public_ip))
         if ip:
             print_success(f"Public IP: {ip}")
             
@@ -138,10 +194,22 @@ class XORZTracker:
 {Colors.YELLOW}-h{Colors.RESET}
     Show help menu
 
+{Colors.YELLOW}--no-ui{Colors.RESET}
+    No spinner (automatic when output is not a terminal)
+    Example: -track 8.8.8.8 --no-ui
+
+{Colors.YELLOW}--dns-server <ip> / --dns-port <port>{Colors.RESET}
+    Query this nameserver instead of the system ones
+    Example: -webtrack github.com --dns-server 1.1.1.1
+
+{Colors.YELLOW}--dns-cache <file>{Colors.RESET}
+    Keep DNS answers in a file until their TTL runs out
+    Example: -webtrack github.com --dns-cache dns_cache.json
+
 {Colors.GREEN}FEATURES:{Colors.RESET}
 • scan IP geolocation
 • Port scanning
-• DNS record lookup
+• DNS record lookup (A, AAAA, CNAME, MX, NS, TXT, SOA)
 • Reverse DNS
 • Web server detection
 • Local network discovery
@@ -179,6 +247,12 @@ class XORZTracker:
 {Colors.YELLOW}-h{Colors.RESET}
     Show this help menu
 
+{Colors.YELLOW}--no-ui{Colors.RESET}
+    Disable the spinner, for scripts
+
+{Colors.YELLOW}--dns-server <ip> --dns-port <port> --dns-cache <file>{Colors.RESET}
+    Nameserver to query and file to keep DNS answers in
+
 {Colors.CYAN}Usage Examples:{Colors.RESET}
 python main.py -track 192.168.1.1
 python main.py -webtrack youtube.com
@@ -218,6 +292,16 @@ python main.py -docs
             for ip in records['A']:
                 print(f"  {ip}")
         
+        if records.get('AAAA'):
+            print(f"\n{Colors.GREEN}AAAA Records:{Colors.RESET}")
+            for ip in records['AAAA']:
+                print(f"  {ip}")
+        
+        if records.get('CNAME'):
+            print(f"\n{Colors.GREEN}CNAME Records:{Colors.RESET}")
+            for cname in records['CNAME']:
+                print(f"  {cname}")
+        
         if records.get('MX'):
             print(f"\n{Colors.GREEN}MX Records:{Colors.RESET}")
             for mx in records['MX']:
@@ -227,6 +311,11 @@ python main.py -docs
             print(f"\n{Colors.GREEN}NS Records:{Colors.RESET}")
             for ns in records['NS']:
                 print(f"  {ns}")
+        
+        if records.get('SOA'):
+            print(f"\n{Colors.GREEN}SOA Record:{Colors.RESET}")
+            for soa in records['SOA']:
+                print(f"  {soa['mname']} {soa['rname']} serial {soa['serial']}")
     
     def _display_web_info(self, web_info):
         Banner.show_section("WEB SERVER")
@@ -251,32 +340,62 @@ python main.py -docs
         
         return local_ips if local_ips else ["No local IPs found"]
     
+    def close(self):
+        self.tools.dns.save()
+        self.executor.shutdown(wait=False)
+    
     def _save_results(self, results):
         filename = f"xorz_track_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         with open(filename, 'w') as f:
             json.dump(results, f, indent=2)
         print_success(f"Results saved to {filename}")
 
+def pop_option(argv, name):
+    # Removes `name <value>` from argv and returns the value
+    if name not in argv:
+        return None
+    index = argv.index(name)
+    if index + 1 >= len(argv):
+        print(f"{Colors.RED}[!] {name} needs a value{Colors.RESET}")
+        sys.exit(1)
+    value = argv[index + 1]
+    del argv[index:index + 2]
+    return value
+
 def main():
-    tracker = XORZTracker()
+    argv = list(sys.argv)
+    if '--no-ui' in argv:
+        argv.remove('--no-ui')
+        Loading.enabled = False
     
-    if len(sys.argv) < 2:
+    nameserver = pop_option(argv, '--dns-server')
+    port = pop_option(argv, '--dns-port')
+    dns = DNSResolver(nameserver=nameserver, port=int(port) if port else 53,
+                      cache_file=pop_option(argv, '--dns-cache'))
+    tracker = XORZTracker(dns)
+    try:
+        run_command(tracker, argv)
+    finally:
+        tracker.close()
+
+def run_command(tracker, argv):
+    if len(argv) < 2:
         tracker.show_help()
         return
     
-    command = sys.argv[1].lower()
+    command = argv[1].lower()
     
     if command == "-track":
-        if len(sys.argv) != 3:
+        if len(argv) != 3:
             print(f"{Colors.RED}Usage: python main.py -track <IP/DOMAIN>{Colors.RESET}")
             return
-        tracker.track(sys.argv[2])
+        tracker.track(argv[2])
     
     elif command == "-webtrack":
-        if len(sys.argv) != 3:
+        if len(argv) != 3:
             print(f"{Colors.RED}Usage: python main.py -webtrack <DOMAIN>{Colors.RESET}")
             return
-        tracker.track_domain(sys.argv[2])
+        tracker.track_domain(argv[2])
     
     elif command == "-myip":
         tracker.show_my_ip()
@@ -3,10 +3,13 @@ import requests
 import json
 from urllib.parse import urlparse
 import concurrent.futures
-import dns.resolver
-from utils import Loading, print_error
+from utils import print_error
+from resolver import DNSResolver
 
 class NetworkTools:
+    def __init__(self, dns=None):
+        self.dns = dns or DNSResolver()
+    
     @staticmethod
     def validate_ip(ip):
         try:
@@ -33,21 +36,17 @@ class NetworkTools:
         return None
     
     @staticmethod
-    def resolve_domain(domain):
+    def domain_name(domain):
+        if not domain.startswith(('http://', 'https://')):
+            domain = 'http://' + domain
+        parsed = urlparse(domain)
+        return parsed.netloc or parsed.path
+    
+    def resolve_domain(self, domain):
         try:
-            if not domain.startswith(('http://', 'https://')):
-                domain = 'http://' + domain
-            
-            parsed = urlparse(domain)
-            domain_name = parsed.netloc or parsed.path
+            domain_name = NetworkTools.domain_name(domain)
             
-            ips = []
-            try:
-                answers = dns.resolver.resolve(domain_name, 'A')
-                for rdata in answers:
-                    ips.append(str(rdata))
-            except:
-                pass
+            ips = list(self.dns.query(domain_name, 'A'))
             
             if not ips:
                 ips.append(socket.gethostbyname(domain_name))
@@ -124,8 +123,6 @@ class NetworkTools:
             except:
                 return (port, False)
         
-        Loading.spin(f"Scanning {len(ports)} ports", 0.5)
-        
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = {executor.submit(check_port, port): port for port in ports}
             for future in concurrent.futures.as_completed(futures):
@@ -143,43 +140,10 @@ class NetworkTools:
         
         return services
     
-    @staticmethod
-    def get_dns_records(domain):
-        records = {}
-        
-        try:
-            answers = dns.resolver.resolve(domain, 'A')
-            records['A'] = [str(rdata) for rdata in answers]
-        except:
-            records['A'] = []
-        
-        try:
-            answers = dns.resolver.resolve(domain, 'MX')
-            records['MX'] = []
-            for rdata in answers:
-                records['MX'].append({
-                    'preference': rdata.preference,
-                    'exchange': str(rdata.exchange)
-                })
-        except:
-            records['MX'] = []
-        
-        try:
-            answers = dns.resolver.resolve(domain, 'TXT')
-            records['TXT'] = []
-            for rdata in answers:
-                for txt_string in rdata.strings:
-                    records['TXT'].append(txt_string.decode('utf-8'))
-        except:
-            records['TXT'] = []
-        
-        try:
-            answers = dns.resolver.resolve(domain, 'NS')
-            records['NS'] = [str(rdata) for rdata in answers]
-        except:
-            records['NS'] = []
-        
-        return records
+    def get_dns_records(self, domain):
+        # Every record type is queried at once; answers come from the
+        # shared cache when resolve_domain already asked for them
+        return self.dns.records(domain)
     
     @staticmethod
     def reverse_dns_lookup(ip):
@@ -0,0 +1,161 @@
+import json
+import os
+import socket
+import threading
+import time
+import concurrent.futures
+import dns.exception
+import dns.rdatatype
+import dns.resolver
+
+RECORD_TYPES = ['A', 'AAAA', 'CNAME', 'MX', 'NS', 'TXT', 'SOA']
+
+
+def parse_rdata(rtype, rdata):
+    if rtype == 'MX':
+        return {'preference': rdata.preference, 'exchange': str(rdata.exchange)}
+    if rtype == 'TXT':
+        return b''.join(rdata.strings).decode('utf-8', 'replace')
+    if rtype == 'SOA':
+        return {
+            'mname': str(rdata.mname),
+            'rname': str(rdata.rname),
+            'serial': rdata.serial,
+            'refresh': rdata.refresh,
+            'retry': rdata.retry,
+            'expire': rdata.expire,
+            'minimum': rdata.minimum
+        }
+    return str(rdata)
+
+
+def negative_ttl(response, default):
+    # RFC 2308: a "no such name/record" answer may be cached for the
+    # smaller of the SOA's TTL and its MINIMUM field
+    if response is None:
+        return default
+    for rrset in response.authority:
+        if rrset.rdtype == dns.rdatatype.SOA:
+            return min(rrset.ttl, rrset[0].minimum)
+    return default
+
+
+class DNSResolver:
+    # One configured resolver for the whole tool. Answers are cached for
+    # their record TTL; with `cache_file` the cache survives between runs.
+    def __init__(self, nameserver=None, port=53, timeout=3, cache_file=None, negative_ttl=60):
+        self.nameserver = nameserver
+        self.port = port
+        self.timeout = timeout
+        self.resolver = None
+        self.negative_ttl = negative_ttl
+        self.cache_file = cache_file
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(RECORD_TYPES))
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        if cache_file:
+            self.load()
+
+    def _get_resolver(self):
+        # Built on first use: without /etc/resolv.conf (e.g. Termux) dnspython
+        # can't configure itself, and only DNS lookups should suffer for it
+        with self._lock:
+            if self.resolver is None:
+                try:
+                    resolver = dns.resolver.Resolver(configure=self.nameserver is None)
+                except dns.resolver.NoResolverConfiguration:
+                    resolver = False
+                else:
+                    if self.nameserver:
+                        resolver.nameservers = [self.nameserver]
+                    resolver.port = self.port
+                    resolver.lifetime = self.timeout
+                self.resolver = resolver
+            return self.resolver
+
+    def _system_query(self, domain, rtype):
+        # Fallback through the system resolver, which only knows addresses
+        family = {'A': socket.AF_INET, 'AAAA': socket.AF_INET6}.get(rtype)
+        if family is None:
+            return []
+        try:
+            infos = socket.getaddrinfo(domain, None, family, socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError):
+            return []
+        return list(dict.fromkeys(info[4][0] for info in infos))
+
+    def _lookup_lock(self, key):
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _cached(self, key):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.time():
+            return entry[1]
+        return None
+
+    def query(self, domain, rtype):
+        key = f"{domain.lower().rstrip('.')}|{rtype}"
+        records = self._cached(key)
+        if records is not None:
+            return records
+        resolver = self._get_resolver()
+        if not resolver:
+            return self._system_query(domain, rtype)
+        # One query per name and type at a time; other threads reuse it
+        with self._lookup_lock(key):
+            records = self._cached(key)
+            if records is not None:
+                return records
+            try:
+                answer = resolver.resolve(domain, rtype, raise_on_no_answer=False)
+            except dns.resolver.NXDOMAIN as e:
+                response = next(iter(e.responses().values()), None)
+                self._entries[key] = (time.time() + negative_ttl(response, self.negative_ttl), [])
+                return []
+            except dns.exception.DNSException:
+                # Timeouts and broken nameservers aren't cached
+                return []
+            if answer.rrset is None:
+                expires = time.time() + negative_ttl(answer.response, self.negative_ttl)
+                records = []
+            else:
+                # Lowest TTL along any CNAME chain that led to the records
+                expires = answer.expiration
+                records = [parse_rdata(rtype, rdata) for rdata in answer.rrset]
+            self._entries[key] = (expires, records)
+            return records
+
+    def records(self, domain, types=RECORD_TYPES):
+        futures = {rtype: self.executor.submit(self.query, domain, rtype) for rtype in types}
+        return {rtype: future.result() for rtype, future in futures.items()}
+
+    def load(self):
+        try:
+            with open(self.cache_file) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, (expires, records) in entries.items():
+            if expires > now:
+                self._entries[key] = (expires, records)
+
+    def save(self):
+        if not self.cache_file:
+            return
+        now = time.time()
+        with self._lock:
+            entries = {key: list(entry) for key, entry in self._entries.items() if entry[0] > now}
+        tmp = self.cache_file + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(entries, f)
+        os.replace(tmp, self.cache_file)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
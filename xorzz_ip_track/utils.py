@@ -1,7 +1,9 @@
 from colorama import init, Fore, Style, Back
 import sys
-import time
 import os
+import shutil
+import threading
+from contextlib import contextmanager
 
 init(autoreset=True)
 
@@ -36,19 +38,93 @@ class Banner:
         print(f"╚{'═' * (len(title) + 2)}╝{Colors.RESET}")
 
 class Loading:
+    # Spinner drawn by its own thread while futures run; the work never
+    # waits on it. Off when stdout isn't a terminal or with --no-ui.
     frames = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
+    enabled = sys.stdout.isatty()
+    interval = 0.1
     
-    @staticmethod
-    def spin(text="", duration=1.5):
-        end_time = time.time() + duration
+    def __init__(self, text=""):
+        self.text = text
+        self.tasks = {}
+        self._drawn = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def track(self, future, label):
+        # The spinner thread reads tasks under the same lock
+        with self._lock:
+            self.tasks[future] = label
+        return future
+    
+    def start(self):
+        if Loading.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self, success=True):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        with self._lock:
+            self._clear()
+            if success and self.text:
+                sys.stdout.write(f"{Colors.GREEN}✓{Colors.RESET} {self.text}\n")
+                sys.stdout.flush()
+    
+    @contextmanager
+    def hold(self):
+        # Print inside this block so output doesn't land on the spinner line
+        with self._lock:
+            self._clear()
+            yield
+    
+    def _clear(self):
+        if self._drawn:
+            sys.stdout.write('\r' + ' ' * self._drawn + '\r')
+            self._drawn = 0
+    
+    def _line(self):
+        running = [label for future, label in self.tasks.items() if not future.done()]
+        finished = len(self.tasks) - len(running)
+        parts = [self.text] if self.text else []
+        if len(self.tasks) > 1:
+            parts.append(f"[{finished}/{len(self.tasks)}]")
+        if running and not self.text:
+            parts.append(', '.join(running))
+        width = shutil.get_terminal_size().columns - 3
+        return ' '.join(parts)[:width]
+    
+    def _run(self):
         i = 0
-        while time.time() < end_time:
-            frame = Loading.frames[i % len(Loading.frames)]
-            sys.stdout.write(f"\r{Colors.YELLOW}{frame}{Colors.RESET} {text}")
-            sys.stdout.flush()
+        while True:
+            with self._lock:
+                line = self._line()
+                frame = Loading.frames[i % len(Loading.frames)]
+                self._clear()
+                sys.stdout.write(f"{Colors.YELLOW}{frame}{Colors.RESET} {line}\r")
+                sys.stdout.flush()
+                self._drawn = len(line) + 2
             i += 1
-            time.sleep(0.1)
-        sys.stdout.write(f"\r{Colors.GREEN}✓{Colors.RESET} {text}\n")
+            if self._stop.wait(Loading.interval):
+                break
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop(success=exc_type is None)
+    
+    @staticmethod
+    def spin(text, future):
+        # Spins until `future` is done and returns its result
+        with Loading(text) as loading:
+            loading.track(future, text)
+            return future.result()
 
 def print_success(msg):
     print(f"{Colors.GREEN}[+]{Colors.RESET} {msg}")